@@ -2,44 +2,129 @@
 Authentication utilities for JWT token management
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple
 
 import jwt
-from fastapi import HTTPException, status, Depends, Request
+from cachetools import TLRUCache, TTLCache
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _load_jwt_keys():
+    """
+    Prepare the JWT signing and verification keys once at import.
+
+    PyJWT accepts prepared keys, so tokens are signed and verified without
+    re-encoding the HMAC secret (or re-parsing PEM for asymmetric
+    algorithms) on every call.
+    """
+    algorithm = jwt.get_algorithm_by_name(settings.JWT_ALGORITHM)
+    if settings.JWT_ALGORITHM.startswith("HS"):
+        key = algorithm.prepare_key(settings.JWT_SECRET_KEY)
+        return key, key
+
+    # PEM values from env files commonly carry escaped newlines
+    private_pem = settings.JWT_PRIVATE_KEY.replace("\\n", "\n")
+    public_pem = settings.JWT_PUBLIC_KEY.replace("\\n", "\n")
+    return algorithm.prepare_key(private_pem), algorithm.prepare_key(public_pem)
+
+
+_JWT_SIGNING_KEY, _JWT_VERIFICATION_KEY = _load_jwt_keys()
+
+# Claims and decode arguments shared by every token, built once
+_JWT_ISSUER = "subsbuzz-api-gateway"
+_JWT_AUDIENCE = "subsbuzz-services"
+_JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+_JWT_LIFETIME = timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
+
+# Verified-token cache. The same bearer token is presented on every request
+# for its whole lifetime, so re-running the HMAC check and payload decode each
+# time is wasted work. Keys are a blake2b digest of the token so bearer
+# material is never retained in cleartext (the token's own claims can't be
+# the key: they are only trustworthy after the signature check). Each entry
+# expires at its token's `exp`, capped at the configured token lifetime.
+_VERIFIED_TOKEN_MAX_TTL = settings.JWT_EXPIRE_MINUTES * 60
+
+
+def _verified_token_expiry(_key: bytes, entry: Dict[str, Any], now: float) -> float:
+    return min(entry["exp"], now + _VERIFIED_TOKEN_MAX_TTL)
+
+
+_verified_tokens: TLRUCache = TLRUCache(
+    maxsize=10_000, ttu=_verified_token_expiry, timer=time.time
+)
+
+# Rejected-token cache. A token that fails verification (bad signature,
+# expired, wrong issuer) can never become valid, yet clients keep sending it
+# until they notice the 401; the rejection is remembered, keyed the same way,
+# so retries are refused without decoding (or logging) it again. Entries only
+# need to outlive the retry burst.
+_REJECTED_TOKEN_TTL = 300
+
+_rejected_tokens: TTLCache = TTLCache(
+    maxsize=10_000, ttl=_REJECTED_TOKEN_TTL, timer=time.time
+)
+
+# HMAC signing/verification takes microseconds, less than a threadpool hop,
+# so it stays on the event loop. Asymmetric algorithms (RSA/ECDSA/EdDSA) are
+# slow enough to stall other requests and are run in the threadpool instead.
+_OFFLOAD_JWT_CRYPTO = not settings.JWT_ALGORITHM.startswith("HS")
+
+# Offloaded verifications in flight, so concurrent first requests with the
+# same token share one decode
+_inflight_verifications: Dict[bytes, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """The authenticated caller, as resolved by get_current_user"""
+    uid: str
+    email: str
+    email_verified: bool = False
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
 def create_jwt_token(user_data: Dict[str, Any]) -> str:
     """
     Create JWT token for API access
     """
     try:
         # Token payload
+        now = datetime.now(timezone.utc)
         payload = {
             "uid": user_data["uid"],
             "email": user_data["email"],
             "email_verified": user_data.get("email_verified", False),
-            "iat": datetime.utcnow(),
-            "exp": datetime.utcnow() + timedelta(minutes=settings.JWT_EXPIRE_MINUTES),
-            "iss": "subsbuzz-api-gateway",
-            "aud": "subsbuzz-services"
+            "iat": now,
+            "exp": now + _JWT_LIFETIME,
+            "iss": _JWT_ISSUER,
+            "aud": _JWT_AUDIENCE
         }
         
         # Create token
         token = jwt.encode(
             payload, 
-            settings.JWT_SECRET_KEY, 
+            _JWT_SIGNING_KEY, 
             algorithm=settings.JWT_ALGORITHM
         )
         
-        logger.info(f"JWT token created for user: {user_data['email']}")
+        logger.debug("JWT token created for user: %s", user_data["email"])
         return token
         
     except Exception as e:
@@ -50,14 +135,112 @@ def create_jwt_token(user_data: Dict[str, Any]) -> str:
         )
 
 
+async def run_jwt_crypto(func, *args):
+    """
+    Run a JWT sign/verify function, in the threadpool for asymmetric keys
+    """
+    if _OFFLOAD_JWT_CRYPTO:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+
+def _cached_entry(key: bytes) -> Optional[Dict[str, Any]]:
+    """Return the unexpired cache entry for a token digest, if any"""
+    return _verified_tokens.get(key)
+
+
+def _store_entry(key: bytes, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cache a verified payload.
+
+    Entries hold the decoded payload and, lazily, the CurrentUser built by
+    authenticate_token, so both are computed once per token.
+    """
+    entry = {"payload": payload, "exp": payload["exp"], "user": None}
+    _verified_tokens[key] = entry
+    return entry
+
+
+def _raise_if_rejected(key: bytes) -> None:
+    """Re-raise the cached verification failure for a token digest, if any"""
+    rejected = _rejected_tokens.get(key)
+    if rejected is not None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=rejected
+        )
+
+
+def _decode_and_store(key: bytes, token: str) -> Dict[str, Any]:
+    """Verify a token on the event loop, caching the outcome either way"""
+    try:
+        return _store_entry(key, _decode_jwt_token(token))
+    except HTTPException as e:
+        _rejected_tokens[key] = e.detail
+        raise
+
+
+def _cached_verification(token: str) -> Dict[str, Any]:
+    """
+    Return the cache entry for a verified token, verifying on miss.
+    """
+    key = _token_key(token)
+    entry = _cached_entry(key)
+    if entry is not None:
+        return entry
+    _raise_if_rejected(key)
+    return _decode_and_store(key, token)
+
+
+async def _cached_verification_async(token: str, key: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Like _cached_verification, but offloads the decode when it is expensive
+    """
+    if key is None:
+        key = _token_key(token)
+    entry = _cached_entry(key)
+    if entry is not None:
+        return entry
+    _raise_if_rejected(key)
+    if not _OFFLOAD_JWT_CRYPTO:
+        return _decode_and_store(key, token)
+
+    future = _inflight_verifications.get(key)
+    if future is None:
+        future = asyncio.ensure_future(run_in_threadpool(_decode_jwt_token, token))
+        _inflight_verifications[key] = future
+        future.add_done_callback(lambda _: _inflight_verifications.pop(key, None))
+    try:
+        payload = await asyncio.shield(future)
+    except HTTPException as e:
+        # Recorded here rather than in the worker thread: the caches are
+        # only ever touched from the event loop
+        _rejected_tokens[key] = e.detail
+        raise
+
+    # The first waiter to resume stores the entry; the rest reuse it
+    return _cached_entry(key) or _store_entry(key, payload)
+
+
 def verify_jwt_token(token: str) -> Dict[str, Any]:
     """
     Verify JWT token and return payload
     """
+    return _cached_verification(token)["payload"]
+
+
+async def verify_jwt_token_async(token: str) -> Dict[str, Any]:
+    """
+    Verify JWT token and return payload, without blocking the event loop
+    """
+    return (await _cached_verification_async(token))["payload"]
+
+
+def _decode_jwt_token(token: str) -> Dict[str, Any]:
+    """
+    Decode and verify a JWT token, bypassing the verification cache
+    """
     try:
-        logger.info(f"Verifying JWT token with secret: {settings.JWT_SECRET_KEY[:10]}...")
-        logger.info(f"JWT algorithm: {settings.JWT_ALGORITHM}")
-        
         # Decode and verify token. PyJWT validates the `exp` claim by default
         # and raises ExpiredSignatureError (caught below) — no manual check
         # needed. The previous manual check used datetime.fromtimestamp which
@@ -65,10 +248,10 @@ def verify_jwt_token(token: str) -> Dict[str, Any]:
         # fresh JWTs to immediately fail when the host runs UTC-behind.
         payload = jwt.decode(
             token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-            audience="subsbuzz-services",
-            issuer="subsbuzz-api-gateway"
+            _JWT_VERIFICATION_KEY,
+            algorithms=_JWT_ALGORITHMS,
+            audience=_JWT_AUDIENCE,
+            issuer=_JWT_ISSUER
         )
         return payload
         
@@ -106,54 +289,114 @@ def get_user_id_from_token(token: str) -> str:
         )
 
 
-def create_internal_api_headers() -> Dict[str, str]:
+# Headers for internal API communication, built once. Treat as read-only:
+# it is shared by every outbound call to the data server.
+INTERNAL_API_HEADERS: Dict[str, str] = {
+    "x-internal-api-key": settings.INTERNAL_API_SECRET,
+    "Content-Type": "application/json"
+}
+
+
+async def authenticate_token(token: str) -> Tuple[bytes, CurrentUser]:
     """
-    Create headers for internal API communication
+    Verify a bearer token and return its cache key and user
+
+    The user is built once per token and shared by every request that
+    presents it.
     """
-    return {
-        "x-internal-api-key": settings.INTERNAL_API_SECRET,
-        "Content-Type": "application/json"
-    }
+    key = _token_key(token)
+    entry = await _cached_verification_async(token, key)
+    if entry["user"] is None:
+        payload = entry["payload"]
+        logger.debug("JWT verification successful for user: %s", payload.get("email"))
+        entry["user"] = CurrentUser(
+            uid=payload["uid"],
+            email=payload["email"],
+            email_verified=payload.get("email_verified", False)
+        )
+    return key, entry["user"]
 
 
-# Bearer token security scheme
-security = HTTPBearer()
+def _bearer_token(scope: Scope) -> Optional[str]:
+    """Bearer credentials from the Authorization header, parsed as HTTPBearer does"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and credentials:
+                return credentials
+            return None
+    return None
 
 
-async def get_current_user(request: Request, token: HTTPBearer = Depends(security)) -> Dict[str, Any]:
-    """
-    Get current user from JWT token
-    """
+async def _authenticate_into(state: Dict[str, Any], token: str) -> None:
+    """Verify a token, recording the user or the error on request state"""
     try:
-        # Extract token from Authorization header
-        auth_header = request.headers.get("Authorization")
-        logger.info(f"Auth header received: {auth_header[:50] if auth_header else 'None'}...")
-        
-        if not auth_header or not auth_header.startswith("Bearer "):
-            logger.warning("Missing or invalid authorization header format")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Missing or invalid authorization header"
-            )
-        
-        token_value = auth_header.split(" ")[1]
-        logger.info(f"Extracted token (first 50 chars): {token_value[:50]}...")
-        
-        # Verify JWT token
-        payload = verify_jwt_token(token_value)
-        logger.info(f"JWT verification successful for user: {payload.get('email')}")
-        
-        return {
-            "uid": payload["uid"],
-            "email": payload["email"],
-            "email_verified": payload.get("email_verified", False)
-        }
-        
-    except HTTPException:
-        raise
+        state["token_hash"], state["user"] = await authenticate_token(token)
+    except HTTPException as e:
+        state["auth_error"] = e
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
-        raise HTTPException(
+        state["auth_error"] = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
-        )
\ No newline at end of file
+        )
+
+
+class AuthMiddleware:
+    """
+    Verify the request's bearer token once, up front.
+
+    The token's digest (request.state.token_hash) and CurrentUser
+    (request.state.user) are kept on the request, so get_current_user and
+    anything else that needs the caller's identity reuse them instead of
+    hashing and looking the token up again. A token that fails verification
+    is not rejected here: the error is kept (request.state.auth_error) and
+    raised by get_current_user, so routes that don't need a user are
+    unaffected.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            token = _bearer_token(scope)
+            if token is not None:
+                await _authenticate_into(scope.setdefault("state", {}), token)
+        await self.app(scope, receive, send)
+
+
+class CurrentUserBearer(HTTPBearer):
+    """
+    Bearer security scheme that resolves straight to the current user.
+
+    It is an HTTPBearer only so routes keep documenting the scheme in
+    OpenAPI: the header was already parsed and verified by AuthMiddleware,
+    so resolving it just reads the result off the request state. Outside
+    the middleware it authenticates the request itself.
+    """
+
+    async def __call__(self, request: Request) -> CurrentUser:
+        state = request.scope.setdefault("state", {})
+        if "user" not in state and "auth_error" not in state:
+            token = _bearer_token(request.scope)
+            if token is not None:
+                await _authenticate_into(state, token)
+
+        user = state.get("user")
+        if user is not None:
+            return user
+        error = state.get("auth_error")
+        if error is not None:
+            raise error
+        # A missing header gets the same 401 + WWW-Authenticate as an
+        # invalid token (HTTPBearer's own error is a 403)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid authorization header",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# Dependency for every route that needs a user: Depends(get_current_user)
+get_current_user = CurrentUserBearer(scheme_name="HTTPBearer", auto_error=False)
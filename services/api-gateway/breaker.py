@@ -0,0 +1,54 @@
+"""
+Circuit breaker for upstream calls
+"""
+
+import time
+from typing import Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream the breaker considers down"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream is down.
+
+    After fail_max consecutive failures the breaker opens and before_call
+    raises CircuitOpenError for reset_timeout seconds, so requests are
+    refused immediately instead of queueing on a dead upstream. The first
+    call after that is let through as a trial (the rest wait out another
+    period): a success closes the breaker, a failure keeps it open. A trial
+    that never reports back (e.g. a cancelled request) just means another
+    trial one period later.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 10.0,
+                 timer: Callable[[], float] = time.monotonic):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._timer = timer
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def before_call(self) -> None:
+        if self._opened_at is None:
+            return
+        now = self._timer()
+        remaining = self._opened_at + self.reset_timeout - now
+        if remaining > 0:
+            raise CircuitOpenError(remaining)
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._opened_at = self._timer()
@@ -0,0 +1,102 @@
+"""
+Per-user read-through cache for upstream responses, backed by Redis
+"""
+
+import logging
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_redis(request: Request):
+    """Shared Redis client set up in the lifespan (None if unavailable)"""
+    return getattr(request.app.state, "redis", None)
+
+
+class UserResponseCache:
+    """
+    Cache raw upstream JSON bodies per user in a single Redis hash.
+
+    Each user's entries live under one key (`<namespace>:<user_id>`), one
+    field per cached read, so everything cached for a user can be dropped
+    with a single DEL when they write. Every field carries its own expiry
+    (stored ahead of the body as `<exp>:`); the key's own TTL only bounds
+    how long idle users' data lingers. Bodies are kept as the bytes the
+    upstream sent, so hits are served without parsing.
+
+    Redis is an optimization here, never a dependency: any Redis error is
+    logged and the call goes straight to the loader.
+    """
+
+    def __init__(self, namespace: str, max_ttl: int):
+        self.namespace = namespace
+        self.max_ttl = max_ttl
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.namespace}:{user_id}"
+
+    async def get_or_load(
+        self,
+        redis_client,
+        user_id: str,
+        field: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Return the cached body for a field, calling the loader on miss"""
+        if redis_client is None or ttl <= 0:
+            return await loader()
+
+        key = self._key(user_id)
+        try:
+            raw = await redis_client.hget(key, field)
+            if raw is not None:
+                exp, _, body = raw.partition(b":")
+                if float(exp) > time.time():
+                    return body
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}:{field}: {e}")
+
+        body = await loader()
+
+        try:
+            entry = b"%.3f:%b" % (time.time() + ttl, body)
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, entry)
+                pipe.expire(key, self.max_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}:{field}: {e}")
+
+        return body
+
+    async def invalidate(self, redis_client, user_id: str) -> None:
+        """Drop every cached entry for a user"""
+        if redis_client is None:
+            return
+        try:
+            await redis_client.delete(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for user {user_id}: {e}")
+
+
+# Dashboard digest reads (latest, detailed, by date, history, available
+# dates). They change at most once per digest run, so routes serve them from
+# Redis for a short TTL and drop a user's entries on any write that changes
+# what their digests show. The email worker DELs the same key after it
+# stores a new digest (tasks.py), so a generated digest shows up at once.
+digest_cache = UserResponseCache(
+    "digest",
+    max_ttl=max(settings.DIGEST_CACHE_TTL, settings.DIGEST_DATES_CACHE_TTL)
+)
+
+
+# User settings (read by the settings page and, on every app load, the theme
+# lookup). Shared by both reads and dropped by every settings write, so a
+# user's own changes show up immediately.
+settings_cache = UserResponseCache("settings", max_ttl=settings.SETTINGS_CACHE_TTL)
@@ -0,0 +1,38 @@
+"""
+Request coalescing for idempotent upstream calls
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight upstream call among identical concurrent requests.
+
+    While a call for a key is running, later callers with the same key await
+    its result instead of issuing their own. The call runs in its own task,
+    so a caller disconnecting does not cancel it for the others. Only use it
+    for idempotent reads whose key (method, URL, query) fully identifies the
+    result.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._pending[key] = task
+            task.add_done_callback(lambda t, key=key: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
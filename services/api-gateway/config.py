@@ -3,6 +3,7 @@ Configuration settings for the API Gateway service
 """
 
 import os
+from functools import lru_cache
 from typing import Any, List
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -22,7 +23,10 @@ class Settings(BaseSettings):
     
     # Security
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-jwt-secret-key-change-in-production")
-    JWT_ALGORITHM: str = "HS256"
+    JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    # PEM keys, only used with asymmetric algorithms (RS256, ES256, EdDSA, ...)
+    JWT_PRIVATE_KEY: str = os.getenv("JWT_PRIVATE_KEY", "")
+    JWT_PUBLIC_KEY: str = os.getenv("JWT_PUBLIC_KEY", "")
     JWT_EXPIRE_MINUTES: int = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
     INTERNAL_API_SECRET: str = os.getenv("INTERNAL_API_SECRET", "your-internal-api-secret")
     
@@ -36,6 +40,19 @@ class Settings(BaseSettings):
     
     # Service URLs
     DATA_SERVER_URL: str = os.getenv("DATA_SERVER_URL", "http://localhost:3001")
+    # Connection pool for the Data Server. HTTP/1.1 needs one connection per
+    # in-flight request; over HTTP/2 (https upstream) a handful multiplex fine.
+    DATA_SERVER_MAX_CONNECTIONS: int = int(os.getenv("DATA_SERVER_MAX_CONNECTIONS", "500"))
+    DATA_SERVER_MAX_KEEPALIVE: int = int(os.getenv("DATA_SERVER_MAX_KEEPALIVE", "200"))
+    # Idle keep-alive connections close after KEEPALIVE_EXPIRY; busy ones never
+    # idle, so the whole client is replaced every CLIENT_MAX_AGE (0 disables)
+    # to pick up upstream routing changes
+    DATA_SERVER_KEEPALIVE_EXPIRY: float = float(os.getenv("DATA_SERVER_KEEPALIVE_EXPIRY", "30"))
+    DATA_SERVER_CLIENT_MAX_AGE: int = int(os.getenv("DATA_SERVER_CLIENT_MAX_AGE", "900"))  # 15 minutes
+    # Circuit breaker: after FAIL_MAX consecutive upstream failures, refuse
+    # Data Server calls for RESET_TIMEOUT seconds
+    DATA_SERVER_BREAKER_FAIL_MAX: int = int(os.getenv("DATA_SERVER_BREAKER_FAIL_MAX", "5"))
+    DATA_SERVER_BREAKER_RESET_TIMEOUT: float = float(os.getenv("DATA_SERVER_BREAKER_RESET_TIMEOUT", "10"))
     EMAIL_WORKER_URL: str = os.getenv("EMAIL_WORKER_URL", "http://localhost:5555")
     API_GATEWAY_URL: str = os.getenv("API_GATEWAY_URL", "http://localhost:8000")
     REDIS_URL: str = os.getenv("REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
@@ -56,9 +73,22 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
     RATE_LIMIT_WINDOW: int = int(os.getenv("RATE_LIMIT_WINDOW", "3600"))  # 1 hour
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis"
+    
+    # Digest read cache in Redis (seconds; 0 disables)
+    DIGEST_CACHE_TTL: int = int(os.getenv("DIGEST_CACHE_TTL", "60"))
+    DIGEST_DATES_CACHE_TTL: int = int(os.getenv("DIGEST_DATES_CACHE_TTL", "300"))
+    DIGEST_HISTORY_CACHE_TTL: int = int(os.getenv("DIGEST_HISTORY_CACHE_TTL", "5"))
+    # User settings read cache in Redis (seconds; 0 disables)
+    SETTINGS_CACHE_TTL: int = int(os.getenv("SETTINGS_CACHE_TTL", "15"))
+    
+    # Health checks
+    HEALTH_CACHE_TTL: float = float(os.getenv("HEALTH_CACHE_TTL", "2"))  # seconds
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Fraction of successful requests written to the access log (errors always are)
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
     
     
     @field_validator('CORS_ORIGINS', 'ALLOWED_HOSTS', mode='before')
@@ -73,10 +103,18 @@ class Settings(BaseSettings):
             return [item.strip() for item in v.split(',') if item.strip()]
         return v
 
+    # Settings are read from the environment once and never mutated
     model_config = {
-        "case_sensitive": True
+        "case_sensitive": True,
+        "frozen": True
     }
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use"""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
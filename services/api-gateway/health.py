@@ -2,10 +2,12 @@
 Health check utilities for the API Gateway
 """
 
+import asyncio
 import logging
 import httpx
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timezone
+import time
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 from urllib.parse import urlparse
 
@@ -29,21 +31,27 @@ class DependencyHealth:
     """Check health of dependent services"""
     
     def __init__(self):
-        self.start_time = datetime.utcnow()
+        self.start_time = datetime.now(timezone.utc)
+        # (monotonic time computed, response) for the last full check
+        self._cached: Optional[Tuple[float, HealthResponse]] = None
+        self._refresh_lock = asyncio.Lock()
     
-    async def check_service(self, service_name: str, url: str) -> str:
+    async def check_service(self, client: httpx.AsyncClient, service_name: str, url: str) -> str:
         """Check if a service is healthy"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with asyncio.timeout(5.0):
                 response = await client.get(f"{url}/health")
+            
+            if response.status_code == 200:
+                logger.debug(f"✅ {service_name} is healthy")
+                return "healthy"
+            else:
+                logger.warning(f"⚠️ {service_name} returned status {response.status_code}")
+                return "unhealthy"
                 
-                if response.status_code == 200:
-                    logger.debug(f"✅ {service_name} is healthy")
-                    return "healthy"
-                else:
-                    logger.warning(f"⚠️ {service_name} returned status {response.status_code}")
-                    return "unhealthy"
-                    
+        except TimeoutError:
+            logger.warning(f"❌ {service_name} health check timed out")
+            return "unreachable"
         except httpx.RequestError as e:
             logger.warning(f"❌ {service_name} connection failed: {e}")
             return "unreachable"
@@ -58,13 +66,13 @@ class DependencyHealth:
             host = parsed.hostname or "localhost"
             port = parsed.port or 6379
 
-            reader, writer = await __import__('asyncio').wait_for(
-                __import__('asyncio').open_connection(host, port),
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port),
                 timeout=3.0
             )
             writer.write(b"PING\r\n")
             await writer.drain()
-            data = await __import__('asyncio').wait_for(reader.read(7), timeout=3.0)
+            data = await asyncio.wait_for(reader.read(7), timeout=3.0)
             writer.close()
             try:
                 await writer.wait_closed()
@@ -78,38 +86,88 @@ class DependencyHealth:
             logger.warning("Redis broker unreachable: %s", e)
             return "unreachable"
 
-    async def check_all_dependencies(self) -> Dict[str, str]:
-        """Check health of all dependent services"""
-        dependencies = {}
-
-        # Check Data Server
-        dependencies["data-server"] = await self.check_service(
-            "Data Server",
-            settings.DATA_SERVER_URL
+    async def check_all_dependencies(self, client: httpx.AsyncClient) -> Dict[str, str]:
+        """Check health of all dependent services concurrently"""
+        data_server, redis_broker = await asyncio.gather(
+            # Check Data Server
+            self.check_service(client, "Data Server", settings.DATA_SERVER_URL),
+            # Check Redis / Celery broker
+            self.check_redis(),
         )
 
-        # Check Redis / Celery broker
-        dependencies["redis-broker"] = await self.check_redis()
-
-        return dependencies
+        return {
+            "data-server": data_server,
+            "redis-broker": redis_broker,
+        }
 
 
     def get_uptime(self) -> float:
         """Get service uptime in seconds"""
-        return (datetime.utcnow() - self.start_time).total_seconds()
+        return (datetime.now(timezone.utc) - self.start_time).total_seconds()
+
+    async def cached_response(
+        self, compute: Callable[[], Awaitable[HealthResponse]]
+    ) -> HealthResponse:
+        """
+        The last composed response while it is younger than HEALTH_CACHE_TTL
+        (only timestamp and uptime are refreshed), else a new one from
+        compute(). Concurrent callers wait on a single refresh, so bursts of
+        probes cause one upstream fan-out.
+        """
+        cached = self._fresh_cached_response()
+        if cached is not None:
+            return cached
+
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited
+            cached = self._fresh_cached_response()
+            if cached is not None:
+                return cached
+
+            response = await compute()
+            self._cached = (time.monotonic(), response)
+            return response
+
+    def _fresh_cached_response(self) -> Optional[HealthResponse]:
+        """Return the cached health response if it is still within its TTL"""
+        if self._cached is None:
+            return None
+        cached_at, response = self._cached
+        if time.monotonic() - cached_at >= settings.HEALTH_CACHE_TTL:
+            return None
+        return response.model_copy(update={
+            "timestamp": _utc_timestamp(),
+            "uptime": self.get_uptime(),
+        })
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO-8601 string with a Z suffix"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
 
 
 # Global health checker instance
 health_checker = DependencyHealth()
 
 
-async def health_check() -> HealthResponse:
+async def health_check(client: httpx.AsyncClient) -> HealthResponse:
     """
     Comprehensive health check for the API Gateway
+
+    `client` is the gateway's shared HTTP client, so probes reuse its
+    connection pool instead of opening a new connection each time.
+
+    The composed response is cached by health_checker for
+    HEALTH_CACHE_TTL seconds; see DependencyHealth.cached_response.
     """
+    return await health_checker.cached_response(lambda: _compute_health(client))
+
+
+async def _compute_health(client: httpx.AsyncClient) -> HealthResponse:
+    """Run the dependency checks and compose the health response"""
     try:
         # Check dependencies
-        dependencies = await health_checker.check_all_dependencies()
+        dependencies = await health_checker.check_all_dependencies(client)
         
         # Determine overall status
         overall_status = "healthy"
@@ -129,7 +187,7 @@ async def health_check() -> HealthResponse:
         
         return HealthResponse(
             status=overall_status,
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            timestamp=_utc_timestamp(),
             service="api-gateway",
             version="2.0.0",
             environment=settings.ENVIRONMENT,
@@ -142,7 +200,7 @@ async def health_check() -> HealthResponse:
         
         return HealthResponse(
             status="error",
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            timestamp=_utc_timestamp(),
             service="api-gateway",
             version="2.0.0",
             environment=settings.ENVIRONMENT,
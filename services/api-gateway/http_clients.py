@@ -0,0 +1,137 @@
+"""
+Shared HTTP clients for upstream calls
+
+Clients are created once in the application lifespan and reused by every
+request, so calls go over warm keep-alive connections instead of paying a
+TCP (and TLS) handshake each time.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from auth import INTERNAL_API_HEADERS
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "SubsBuzz-API-Gateway/2.0"
+
+# Data Server client: base_url and internal API key preset
+_data_server_client: Optional[httpx.AsyncClient] = None
+
+# Background task that periodically replaces _data_server_client
+_recycle_task: Optional[asyncio.Task] = None
+
+# Client for third-party APIs (Google OAuth). Deliberately carries no
+# internal headers so the internal API key never leaves the cluster.
+_external_client: Optional[httpx.AsyncClient] = None
+
+
+async def _log_protocol_once(response: httpx.Response) -> None:
+    """Log the HTTP version negotiated with the Data Server, on first response"""
+    if _data_server_client is None:
+        return
+    hooks = _data_server_client.event_hooks["response"]
+    if _log_protocol_once in hooks:
+        hooks.remove(_log_protocol_once)
+        # HTTP/1.1 here means the upstream is plain http:// (no TLS ALPN)
+        logger.info(f"Data Server connection: {response.http_version}")
+
+
+def _create_data_server_client() -> httpx.AsyncClient:
+    """Data Server client with base_url and the internal API key preset"""
+    # Keep-alive pool sized for a gateway that proxies most requests
+    # upstream. HTTP/2 multiplexes every proxied call over a few connections,
+    # but httpx only negotiates it via TLS ALPN: against a plain http://
+    # Data Server (the default deployment) requests stay on HTTP/1.1 and the
+    # pool size is what bounds upstream concurrency.
+    return httpx.AsyncClient(
+        base_url=settings.DATA_SERVER_URL,
+        http2=True,
+        timeout=httpx.Timeout(connect=2.0, read=30.0, write=30.0, pool=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.DATA_SERVER_MAX_KEEPALIVE,
+            max_connections=settings.DATA_SERVER_MAX_CONNECTIONS,
+            keepalive_expiry=settings.DATA_SERVER_KEEPALIVE_EXPIRY
+        ),
+        headers={**INTERNAL_API_HEADERS, "user-agent": USER_AGENT},
+        event_hooks={"response": [_log_protocol_once]}
+    )
+
+
+async def _recycle_data_server_client(max_age: int) -> None:
+    """
+    Replace the Data Server client every max_age seconds
+
+    httpx has no maximum connection lifetime, and keepalive_expiry only
+    closes idle connections, so under steady traffic a connection could stay
+    pinned to the same upstream backend forever. New requests pick up the
+    fresh client immediately; the old one is closed once requests already
+    in flight on it have had their read timeout to finish.
+    """
+    global _data_server_client
+
+    while True:
+        await asyncio.sleep(max_age)
+        old_client = _data_server_client
+        _data_server_client = _create_data_server_client()
+        logger.debug("Data Server client recycled")
+        if old_client is not None:
+            try:
+                await asyncio.sleep(old_client.timeout.read or 30.0)
+            finally:
+                await old_client.aclose()
+
+
+async def startup() -> None:
+    """Create the shared clients"""
+    global _data_server_client, _external_client, _recycle_task
+
+    _data_server_client = _create_data_server_client()
+    if settings.DATA_SERVER_CLIENT_MAX_AGE > 0:
+        _recycle_task = asyncio.create_task(
+            _recycle_data_server_client(settings.DATA_SERVER_CLIENT_MAX_AGE)
+        )
+
+    _external_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        headers={"user-agent": USER_AGENT}
+    )
+    logger.info("✅ HTTP clients initialized")
+
+
+async def shutdown() -> None:
+    """Close the shared clients"""
+    global _data_server_client, _external_client, _recycle_task
+
+    if _recycle_task is not None:
+        _recycle_task.cancel()
+        try:
+            await _recycle_task
+        except asyncio.CancelledError:
+            pass
+        _recycle_task = None
+
+    for client in (_data_server_client, _external_client):
+        if client is not None:
+            await client.aclose()
+    _data_server_client = None
+    _external_client = None
+
+
+def get_data_server_client() -> httpx.AsyncClient:
+    """Shared client for the Data Server (usable as a FastAPI dependency)"""
+    if _data_server_client is None:
+        raise RuntimeError("HTTP clients not initialized; is the app lifespan running?")
+    return _data_server_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared client for external APIs (usable as a FastAPI dependency)"""
+    if _external_client is None:
+        raise RuntimeError("HTTP clients not initialized; is the app lifespan running?")
+    return _external_client
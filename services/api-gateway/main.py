@@ -9,23 +9,24 @@ This service provides:
 - API documentation with Swagger/OpenAPI
 """
 
+import asyncio
 import os
 import logging
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
-import httpx
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+import orjson
+import redis.asyncio as aioredis
 
-from auth import create_jwt_token, verify_jwt_token
-from middleware import LoggingMiddleware, RateLimitMiddleware, SecurityHeadersMiddleware, RequestIDMiddleware
+from auth import AuthMiddleware
+from middleware import GatewayMiddleware, RateLimitMiddleware, UnhandledErrorMiddleware
 from config import settings
+import http_clients
 from health import health_check, HealthResponse
 from routes import auth as auth_routes, digest, monitored_emails, settings as settings_routes, emails as email_routes, email_categories, subscriptions as subscriptions_routes, onboarding as onboarding_routes, account as account_routes
 
@@ -36,31 +37,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# HTTP client for service communication
-http_client: Optional[httpx.AsyncClient] = None
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
-    global http_client
-    
     # Startup
     logger.info("🚀 Starting API Gateway...")
-    http_client = httpx.AsyncClient(
-        timeout=30.0,
-        headers={
-            "x-internal-api-key": settings.INTERNAL_API_SECRET,
-            "user-agent": "SubsBuzz-API-Gateway/2.0"
-        }
-    )
-    logger.info("✅ HTTP client initialized")
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+    # Pooled clients for the Data Server and external APIs
+    await http_clients.startup()
+    
+    # Redis backs the digest and settings read caches and, optionally, shared
+    # rate-limit state across workers/replicas. It connects lazily; short
+    # timeouts keep an unreachable Redis from stalling requests (all of its
+    # users fail open).
+    app.state.redis = None
+    app.state.rate_limit_redis = None
+    if (settings.RATE_LIMIT_BACKEND == "redis" or settings.DIGEST_CACHE_TTL > 0
+            or settings.SETTINGS_CACHE_TTL > 0):
+        app.state.redis = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1.0,
+            socket_timeout=1.0
+        )
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        app.state.rate_limit_redis = app.state.redis
+        logger.info("✅ Redis rate limiting enabled")
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down API Gateway...")
-    if http_client:
-        await http_client.aclose()
+    await http_clients.shutdown()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
     logger.info("✅ Cleanup complete")
 
 
@@ -73,17 +82,59 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=ORJSONResponse
 )
 
-# Security
-security = HTTPBearer(auto_error=False)
+# Error responses. The envelope is fixed, so its static parts are kept as
+# pre-encoded bytes and only message/timestamp are serialized per error
+# (with orjson, skipping model construction and validation).
+_ERROR_PREFIX = b'{"error":true,"message":'
+_ERROR_SUFFIX = b',"service":"api-gateway"}'
+
+
+def _error_response(status_code: int, message: Any, code: str, request: Request,
+                    headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build the gateway's standard JSON error body"""
+    body = b"".join((
+        _ERROR_PREFIX,
+        orjson.dumps(message),
+        b',"code":', orjson.dumps(code),
+        b',"timestamp":', orjson.dumps(getattr(request.state, 'timestamp', '')),
+        _ERROR_SUFFIX,
+    ))
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
+
+
+# Exception handlers
+@app.exception_handler(HTTPException)
+async def http_exception_handler(request: Request, exc: HTTPException):
+    return _error_response(exc.status_code, exc.detail, "HTTP_ERROR", request, exc.headers)
+
+
+# Route handlers don't catch unexpected errors themselves; they all end up
+# here, logged once with enough context to find the request
+@app.exception_handler(Exception)
+async def general_exception_handler(request: Request, exc: Exception):
+    logger.error(
+        "Unhandled exception on %s %s (request %s): %s",
+        request.method, request.url.path,
+        getattr(request.state, 'request_id', '-'), exc,
+        exc_info=True
+    )
+    return _error_response(500, "Internal server error", "INTERNAL_ERROR", request)
+
 
 # Middleware setup (order matters - last added = outermost = runs first!)
 # Inner middleware (runs last)
-app.add_middleware(RequestIDMiddleware)
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(UnhandledErrorMiddleware, handler=general_exception_handler)
+app.add_middleware(AuthMiddleware)
+app.add_middleware(GatewayMiddleware, log_sample_rate=settings.LOG_SAMPLE_RATE)
 app.add_middleware(RateLimitMiddleware, requests_per_minute=settings.RATE_LIMIT_REQUESTS)
 
 app.add_middleware(
@@ -91,51 +142,19 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
-# CORS must be outermost to handle preflight OPTIONS before other middleware
+# CORS must be outermost to handle preflight OPTIONS before other middleware.
+# Methods and headers are listed explicitly (what the frontend actually
+# sends) so preflight responses are fixed rather than echoing whatever
+# headers the browser asks for.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 
-# Pydantic models
-class ErrorResponse(BaseModel):
-    error: bool = True
-    message: str
-    code: Optional[str] = None
-    timestamp: str
-    service: str = "api-gateway"
-
-
-# Exception handlers
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(
-            message=exc.detail,
-            code="HTTP_ERROR",
-            timestamp=getattr(request.state, 'timestamp', ''),
-        ).dict()
-    )
-
-
-@app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content=ErrorResponse(
-            message="Internal server error",
-            code="INTERNAL_ERROR",
-            timestamp=getattr(request.state, 'timestamp', ''),
-        ).dict()
-    )
-
-
 # ==================== HEALTH & STATUS ====================
 
 @app.get("/health/live", tags=["Health"])
@@ -151,7 +170,7 @@ async def liveness_endpoint():
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_endpoint():
     """API Gateway health check"""
-    return await health_check()
+    return await health_check(http_clients.get_data_server_client())
 
 
 @app.get("/", tags=["Root"])
@@ -186,5 +205,7 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=True if settings.ENVIRONMENT == "development" else False,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file
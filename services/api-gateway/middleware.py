@@ -3,79 +3,82 @@ Middleware for the API Gateway service
 """
 
 import time
+import random
 import logging
-from typing import Dict, Any
-from collections import defaultdict, deque
+import secrets
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Tuple
 
-from fastapi import Request, Response, HTTPException, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Request/response logging middleware"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Add timestamp to request state
-        start_time = time.time()
-        request.state.timestamp = time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-        
-        # Log request
-        logger.info(
-            f"📥 {request.method} {request.url.path} - "
-            f"Client: {request.client.host if request.client else 'unknown'}"
-        )
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"📤 {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Duration: {duration:.3f}s"
-        )
-        
-        # Add timing header
-        response.headers["X-Process-Time"] = str(duration)
-        
-        return response
+# Fixed-window counter executed atomically in Redis: one round-trip per
+# request, shared by every gateway worker and replica.
+_RATE_LIMIT_LUA = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+return n
+"""
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting middleware"""
+class RateLimitMiddleware:
+    """Simple rate limiting middleware
+
+    The default in-memory backend uses a two-bucket sliding-window counter per
+    client: the count for the current minute plus the previous minute's count
+    weighted by how much of it still overlaps the trailing 60 seconds.
+    Constant work and a single small tuple per client, instead of one
+    timestamp per request.
+
+    With RATE_LIMIT_BACKEND=redis the count lives in Redis (app.state.rate_limit_redis,
+    set up in the lifespan) so limits hold across workers and restarts. If
+    Redis is unreachable the request is counted in memory instead.
+
+    Written as a plain ASGI middleware: it either answers with its own 429 or
+    forwards the request untouched, adding its headers as the response
+    starts.
+    """
     
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
+    _EXEMPT_PATHS = frozenset({"/health", "/docs", "/openapi.json", "/redoc"})
+    
+    def __init__(self, app: ASGIApp, requests_per_minute: int = 60):
+        self.app = app
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, deque] = defaultdict(deque)
+        # client_ip -> (minute_epoch, count_current, count_previous)
+        self.buckets: Dict[str, Tuple[int, int, int]] = {}
+        self._last_sweep = 0
+        self._redis_script = None
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/docs", "/openapi.json"]:
-            return await call_next(request)
+        if scope["path"] in self._EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
         
-        # Get client IP
-        client_ip = self._get_client_ip(request)
+        # Get client IP (kept on request.state for handlers)
+        client_ip = self._get_client_ip(scope)
+        scope.setdefault("state", {})["client_ip"] = client_ip
         current_time = time.time()
         
-        # Clean old requests
-        minute_ago = current_time - 60
-        client_requests = self.requests[client_ip]
-        
-        # Remove requests older than 1 minute
-        while client_requests and client_requests[0] < minute_ago:
-            client_requests.popleft()
+        count = None
+        redis_client = getattr(scope["app"].state, "rate_limit_redis", None)
+        if redis_client is not None:
+            count = await self._hit_redis(redis_client, client_ip, current_time)
+        if count is None:
+            count = self._hit_memory(client_ip, current_time)
         
         # Check rate limit
-        if len(client_requests) >= self.requests_per_minute:
+        if count > self.requests_per_minute:
             logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": True,
@@ -84,80 +87,218 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "retry_after": 60
                 }
             )
+            await response(scope, receive, send)
+            return
         
-        # Add current request
-        client_requests.append(current_time)
+        # Rate limit headers
+        rate_headers = [
+            (b"x-ratelimit-limit", str(self.requests_per_minute).encode()),
+            (b"x-ratelimit-remaining", str(max(0, int(self.requests_per_minute - count))).encode()),
+            (b"x-ratelimit-reset", str(int(current_time + 60)).encode()),
+        ]
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *rate_headers]
+            await send(message)
         
         # Process request
-        response = await call_next(request)
+        await self.app(scope, receive, send_with_headers)
+    
+    async def _hit_redis(self, redis_client, client_ip: str, current_time: float):
+        """Count this request in Redis; returns None if Redis is unavailable"""
+        if self._redis_script is None:
+            self._redis_script = redis_client.register_script(_RATE_LIMIT_LUA)
+        key = f"rl:{client_ip}:{int(current_time // 60)}"
+        try:
+            return await self._redis_script(keys=[key], args=[60])
+        except Exception as e:
+            logger.warning(f"Redis rate limit unavailable, using in-memory counter: {e}")
+            return None
+    
+    def _hit_memory(self, client_ip: str, current_time: float) -> float:
+        """Count this request in memory and return the weighted window count"""
+        minute = int(current_time // 60)
         
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(
-            max(0, self.requests_per_minute - len(client_requests))
-        )
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + 60))
+        # Drop buckets that can no longer affect the window, once a minute
+        if minute != self._last_sweep:
+            self._sweep(minute)
+        
+        # Roll the client's bucket forward to the current minute
+        bucket_minute, current, previous = self.buckets.get(client_ip, (minute, 0, 0))
+        if bucket_minute == minute - 1:
+            current, previous = 0, current
+        elif bucket_minute != minute:
+            current, previous = 0, 0
         
-        return response
+        # Weighted count over the trailing 60 seconds, including this request
+        elapsed = (current_time % 60) / 60
+        effective = current + 1 + previous * (1 - elapsed)
+        
+        # Rejected requests don't consume quota
+        if effective <= self.requests_per_minute:
+            current += 1
+        self.buckets[client_ip] = (minute, current, previous)
+        return effective
+    
+    def _sweep(self, minute: int) -> None:
+        """Evict buckets older than the previous minute"""
+        self._last_sweep = minute
+        stale = [ip for ip, (m, _, _) in self.buckets.items() if m < minute - 1]
+        for ip in stale:
+            del self.buckets[ip]
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope) -> str:
         """Extract client IP from request"""
-        # Check for forwarded headers (when behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        # Check for real IP header
-        real_ip = request.headers.get("X-Real-IP")
+        # Single pass over the raw header list. X-Forwarded-For (when behind
+        # a proxy) wins over X-Real-IP, which wins over the socket peer.
+        real_ip = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                # An empty first hop falls through, so such clients don't
+                # all share one "" bucket
+                first_hop = value.split(b",", 1)[0].strip()
+                if first_hop:
+                    return first_hop.decode("latin-1")
+            if name == b"x-real-ip" and real_ip is None:
+                real_ip = value
         if real_ip:
-            return real_ip
+            return real_ip.decode("latin-1")
         
         # Fall back to client host
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to responses"""
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        # Content Security Policy (adjust as needed)
-        if request.url.path not in ["/docs", "/redoc"]:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: https:; "
-                "font-src 'self'; "
-                "connect-src 'self'; "
-                "frame-ancestors 'none'"
-            )
-        
-        return response
+# Paths that serve the interactive docs and need their own script sources
+_DOCS_PATHS = frozenset({"/docs", "/redoc"})
 
+# Security headers, pre-encoded once in the raw (bytes) form Starlette
+# stores them in so each response only needs a list extend.
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+]
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Add unique request ID to each request"""
+# Content Security Policy (adjust as needed)
+_CSP_HEADER = (
+    b"content-security-policy",
+    b"default-src 'self'; "
+    b"script-src 'self' 'unsafe-inline'; "
+    b"style-src 'self' 'unsafe-inline'; "
+    b"img-src 'self' data: https:; "
+    b"font-src 'self'; "
+    b"connect-src 'self'; "
+    b"frame-ancestors 'none'"
+)
+
+
+class GatewayMiddleware:
+    """Request ID, request/response logging and security headers
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so requests skip
+    the task/stream bridge Starlette puts around call_next. Headers are added
+    to the http.response.start message as it passes through.
+
+    Each request produces at most one access-log record, emitted when the
+    response starts. Successful responses are sampled at `log_sample_rate`;
+    4xx/5xx responses are always logged.
+    """
+    
+    def __init__(self, app: ASGIApp, log_sample_rate: float = 1.0):
+        self.app = app
+        self.log_sample_rate = log_sample_rate
     
-    async def dispatch(self, request: Request, call_next):
-        import uuid
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Generate request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        # Generate request ID and add timestamp to request state
+        start_time = time.time()
+        request_id = secrets.token_hex(16)
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["timestamp"] = datetime.fromtimestamp(start_time, tz=timezone.utc).strftime(
+            '%Y-%m-%dT%H:%M:%S.%fZ'
+        )
         
-        # Process request
-        response = await call_next(request)
+        path = scope["path"]
         
-        # Add request ID to response
-        response.headers["X-Request-ID"] = request_id
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate duration
+                duration = time.time() - start_time
+                
+                # Log response (sampled unless it's an error)
+                status_code = message["status"]
+                if logger.isEnabledFor(logging.INFO) and (
+                    status_code >= 400 or random.random() < self.log_sample_rate
+                ):
+                    client = scope.get("client")
+                    logger.info(
+                        "📤 %s %s - Status: %s - Duration: %.3fs",
+                        scope["method"], path, status_code, duration,
+                        extra={
+                            "method": scope["method"],
+                            "path": path,
+                            "status": status_code,
+                            "duration": duration,
+                            "client": client[0] if client else "unknown",
+                            "request_id": request_id,
+                        }
+                    )
+                
+                # Request ID, timing and security headers in one pass
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-request-id", request_id.encode()))
+                headers.append((b"x-process-time", str(duration).encode()))
+                headers.extend(_SECURITY_HEADERS)
+                if path not in _DOCS_PATHS:
+                    headers.append(_CSP_HEADER)
+                message["headers"] = headers
+            await send(message)
         
-        return response
\ No newline at end of file
+        # Process request
+        await self.app(scope, receive, send_with_headers)
+
+
+class UnhandledErrorMiddleware:
+    """
+    Answer unhandled route errors with the app's 500 response.
+
+    Starlette runs the `Exception` handler from its outermost middleware,
+    outside CORS and GatewayMiddleware, so those 500s went out without CORS
+    or request-ID headers (browsers then report a CORS failure instead of
+    the error). Added as the innermost middleware, this hands the error to
+    the same handler while every other middleware still wraps the response.
+    Errors after the response has started are re-raised as before.
+    """
+
+    def __init__(self, app: ASGIApp, handler: Callable[[Request, Exception], Awaitable[Response]]):
+        self.app = app
+        self.handler = handler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as exc:
+            if response_started:
+                raise
+            response = await self.handler(Request(scope), exc)
+            await response(scope, receive, send)
@@ -0,0 +1,189 @@
+"""
+Proxying to the Data Server, shared by every router
+"""
+
+import asyncio
+import logging
+import math
+import random
+from typing import Any, Dict, Optional
+
+import httpx
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from breaker import CircuitBreaker, CircuitOpenError
+from coalesce import RequestCoalescer
+from config import settings
+from http_clients import get_data_server_client
+
+logger = logging.getLogger(__name__)
+
+# Identical concurrent GETs (e.g. a page firing the same query from several
+# components) share a single upstream call
+_coalescer = RequestCoalescer()
+
+# Data Server routes are all mounted under /api; the host and internal
+# headers live on the shared client (base_url and default headers)
+_API_PREFIX = "/api/"
+
+# While the Data Server is down (connection failures or 502/503/504),
+# requests are refused with a 503 instead of piling onto it
+_breaker = CircuitBreaker(
+    fail_max=settings.DATA_SERVER_BREAKER_FAIL_MAX,
+    reset_timeout=settings.DATA_SERVER_BREAKER_RESET_TIMEOUT
+)
+_UNAVAILABLE_STATUSES = frozenset((502, 503, 504))
+
+# One quick retry for a failed connect (nothing was sent) or, on GETs, a
+# 502/503 from an upstream that is momentarily recycling
+_RETRY_STATUSES = frozenset((502, 503))
+_RETRY_WAIT = 0.05  # seconds, plus up to as much again in jitter
+_RETRY_MAX_WAIT = 0.5  # longer Retry-After hints aren't worth holding the request for
+
+
+def _error_detail(response: httpx.Response) -> str:
+    """
+    Error message from a Data Server error response
+
+    Data Server routes report errors as `{"error": ...}` (apiError) and a
+    few as `{"message": ...}`; data-server codes such as 409 DUPLICATE or
+    400 INVALID_CATEGORY are surfaced to the client either way.
+    """
+    try:
+        payload = orjson.loads(response.content)
+        return payload.get("error") or payload.get("message") or "Service error"
+    except Exception:
+        return response.text or "Service error"
+
+
+def _retry_wait(response: Optional[httpx.Response] = None) -> Optional[float]:
+    """Seconds to wait before retrying, or None if a retry isn't worth it"""
+    wait = _RETRY_WAIT + random.uniform(0, _RETRY_WAIT)
+    if response is None:
+        return wait
+    retry_after = response.headers.get("retry-after")
+    if retry_after is None:
+        return wait
+    try:
+        hinted = float(retry_after)
+    except ValueError:
+        # HTTP-date form; a date worth honouring is too far off anyway
+        return None
+    return max(hinted, wait) if hinted <= _RETRY_MAX_WAIT else None
+
+
+async def _send_to_data_server(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    content: Optional[bytes],
+    params: Optional[Dict]
+) -> httpx.Response:
+    """Send one request to the Data Server through the breaker, retrying once"""
+    try:
+        _breaker.before_call()
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Data Server unavailable",
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+
+    retried = False
+    while True:
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                content=content,
+                params=params
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if retried:
+                _breaker.record_failure()
+                raise
+            retried = True
+            await asyncio.sleep(_retry_wait())
+            continue
+        except httpx.PoolTimeout:
+            # Our own connection pool is saturated; says nothing about the
+            # Data Server, so it must not count towards opening the breaker
+            raise
+        except httpx.RequestError:
+            _breaker.record_failure()
+            raise
+
+        if response.status_code in _UNAVAILABLE_STATUSES:
+            if method == "GET" and not retried and response.status_code in _RETRY_STATUSES:
+                wait = _retry_wait(response)
+                if wait is not None:
+                    retried = True
+                    await asyncio.sleep(wait)
+                    continue
+            _breaker.record_failure()
+        else:
+            _breaker.record_success()
+        return response
+
+
+async def proxy_raw_to_data_server(
+    method: str,
+    path: str,
+    json_data: Optional[Dict] = None,
+    params: Optional[Dict] = None
+) -> bytes:
+    """Proxy request to Data Server, returning the raw JSON response body"""
+
+    url = _API_PREFIX + path.lstrip("/")
+    client = get_data_server_client()
+    # Encoded with orjson rather than httpx's stdlib json; the client already
+    # sends Content-Type: application/json
+    content = orjson.dumps(json_data) if json_data is not None else None
+
+    async def send() -> httpx.Response:
+        return await _send_to_data_server(client, method, url, content, params)
+
+    try:
+        if method == "GET":
+            key = (url, tuple(sorted(params.items())) if params else ())
+            response = await _coalescer.run(key, send)
+        else:
+            response = await send()
+    except httpx.RequestError as e:
+        logger.error(f"Request error to Data Server: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Data Server unavailable: {str(e)}"
+        )
+
+    if response.status_code >= 400:
+        log = logger.error if response.status_code >= 500 else logger.warning
+        log(f"Data Server error: {response.status_code} - {response.text}")
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=_error_detail(response)
+        )
+
+    return response.content
+
+
+async def proxy_to_data_server(
+    method: str,
+    path: str,
+    json_data: Optional[Dict] = None,
+    params: Optional[Dict] = None
+) -> Dict[str, Any]:
+    """Proxy request to Data Server with internal authentication"""
+    return orjson.loads(await proxy_raw_to_data_server(method, path, json_data, params))
+
+
+def passthrough(body: bytes) -> Response:
+    """
+    Forward a Data Server body unchanged.
+
+    The Data Server already answers in the gateway's `{"success": true,
+    "data": ...}` envelope, so there is nothing to parse or re-serialize.
+    """
+    return Response(content=body, media_type="application/json")
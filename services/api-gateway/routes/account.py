@@ -10,38 +10,42 @@ email back) is enforced in the frontend modal.
 import logging
 from typing import Any, Dict
 
-import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from auth import get_current_user, create_internal_api_headers
-from config import settings
+from auth import CurrentUser, get_current_user
+from cache import digest_cache, get_redis, settings_cache
+from http_clients import get_data_server_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.delete("")
-async def delete_account(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+async def delete_account(
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis),
+) -> Dict[str, Any]:
     """
     Hard-delete every row owned by the current user. Cascades through
     oauth_tokens, monitored_emails, user_settings, email_digests +
     digest_emails, thematic_* + theme_source_emails, subscriptions, and
     email_categories. Once this returns, the user's session is also
     effectively dead (the JWT still has 60min TTL but every API call that
-    needs oauth_tokens / user_settings will 401/404).
+    needs oauth_tokens / user_settings will 401/404). The gateway's cached
+    digest and settings reads are dropped too, so they aren't served from
+    Redis for the rest of that session.
 
     Frontend should call this and then immediately clear local tokens +
     redirect to /login.
     """
-    user_id = current_user["uid"]
-    email = current_user.get("email", "(unknown)")
+    user_id = current_user.uid
+    email = current_user.email
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.delete(
-                f"{settings.DATA_SERVER_URL}/api/storage/account/{user_id}",
-                headers=create_internal_api_headers(),
-            )
+        resp = await get_data_server_client().delete(
+            f"/api/storage/account/{user_id}"
+        )
 
         if not resp.is_success:
             logger.error(
@@ -53,7 +57,10 @@ async def delete_account(current_user: Dict[str, Any] = Depends(get_current_user
                 detail="Account deletion failed — your data is still intact. Please try again or contact support.",
             )
 
-        body = resp.json()
+        await digest_cache.invalidate(redis_client, user_id)
+        await settings_cache.invalidate(redis_client, user_id)
+
+        body = orjson.loads(resp.content)
         deleted = body.get("data", {}).get("deleted", {})
         logger.warning(
             "Account deleted user=%s email=%s deleted=%s",
@@ -2,26 +2,27 @@
 Authentication routes for the API Gateway
 """
 
+import asyncio
+import html
+import json
 import logging
-from typing import Dict, Any
+import uuid
+from dataclasses import asdict
+from typing import Dict, Any, Optional
 from urllib.parse import urlencode
 
+import jwt
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import HTMLResponse, RedirectResponse
 from pydantic import BaseModel
-import httpx
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-
-from auth import create_jwt_token, verify_jwt_token
+from auth import CurrentUser, create_jwt_token, get_current_user, run_jwt_crypto
 from config import settings
+from http_clients import get_data_server_client, get_http_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-security = HTTPBearer(auto_error=False)
 
 
 # gmail.modify covers: reading messages, changing labels (including UNREAD/INBOX),
@@ -30,6 +31,19 @@ security = HTTPBearer(auto_error=False)
 # in the GCP OAuth Consent Screen.
 GMAIL_OAUTH_SCOPES = "https://www.googleapis.com/auth/gmail.modify openid email profile"
 
+# Authorization URLs differ per request only in `state`, so everything else
+# is encoded once here and requests just append the state parameter
+_AUTH_URL_PARAMS = {
+    "client_id": settings.GOOGLE_CLIENT_ID,
+    "redirect_uri": settings.OAUTH_REDIRECT_URI,
+    "response_type": "code",
+    "scope": GMAIL_OAUTH_SCOPES,
+    "access_type": "offline",
+    "prompt": "consent",
+}
+_AUTH_URL_PREFIX = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(_AUTH_URL_PARAMS)}"
+_REAUTH_URL_PREFIX = f"{_AUTH_URL_PREFIX}&include_granted_scopes=true"
+
 
 # Pydantic models
 class AuthResponse(BaseModel):
@@ -64,32 +78,6 @@ class OAuthCallbackRequest(BaseModel):
     state: str
 
 
-# Dependency to get current user
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> Dict[str, Any]:
-    """Extract and verify JWT token from Authorization header"""
-    if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    try:
-        payload = verify_jwt_token(credentials.credentials)
-        return payload
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.warning(f"Token verification failed: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-
 class RefreshRequest(BaseModel):
     """Request model for token refresh via session token"""
     sessionToken: str
@@ -101,14 +89,13 @@ async def _get_oauth_record(uid: str) -> dict:
     Returns {} on any failure — callers should treat that as "no connection".
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                f"{settings.DATA_SERVER_URL}/api/storage/oauth-token/{uid}",
-                headers={"x-internal-api-key": settings.INTERNAL_API_SECRET}
-            )
+        resp = await get_data_server_client().get(
+            f"/api/storage/oauth-token/{uid}",
+            timeout=10.0
+        )
         if not resp.is_success:
             return {}
-        return resp.json().get("data", {}) or {}
+        return orjson.loads(resp.content).get("data", {}) or {}
     except Exception as e:
         logger.warning(f"Could not fetch OAuth record for uid={uid}: {e}")
         return {}
@@ -131,61 +118,49 @@ async def refresh_token(request: RefreshRequest):
     Refresh JWT token using a long-lived session token stored in the database.
     Does not require a valid JWT — the session token is the credential.
     """
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{settings.DATA_SERVER_URL}/api/storage/session-validate",
-                json={"sessionToken": request.sessionToken},
-                headers={"x-internal-api-key": settings.INTERNAL_API_SECRET}
-            )
+    resp = await get_data_server_client().post(
+        "/api/storage/session-validate",
+        content=orjson.dumps({"sessionToken": request.sessionToken})
+    )
 
-        if not resp.is_success:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired session token"
-            )
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired session token"
+        )
+
+    user_data = orjson.loads(resp.content).get("data", {})
+    new_token = await run_jwt_crypto(create_jwt_token, {
+        "uid": user_data["uid"],
+        "email": user_data["email"],
+        "email_verified": False
+    })
 
-        user_data = resp.json().get("data", {})
-        new_token = create_jwt_token({
+    # Include granted scopes so the settings page can decide synchronously
+    # whether to prompt for re-consent before enabling cleanup actions.
+    scopes = await _get_granted_scopes(user_data["uid"])
+
+    return {
+        "success": True,
+        "token": new_token,
+        "user": {
             "uid": user_data["uid"],
             "email": user_data["email"],
-            "email_verified": False
-        })
-
-        # Include granted scopes so the settings page can decide synchronously
-        # whether to prompt for re-consent before enabling cleanup actions.
-        scopes = await _get_granted_scopes(user_data["uid"])
-
-        return {
-            "success": True,
-            "token": new_token,
-            "user": {
-                "uid": user_data["uid"],
-                "email": user_data["email"],
-                "scopes": scopes,
-            },
-            "message": "Token refreshed successfully"
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Token refresh failed: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to refresh token"
-        )
+            "scopes": scopes,
+        },
+        "message": "Token refreshed successfully"
+    }
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get current user information, including currently-granted OAuth scopes."""
-    scopes = await _get_granted_scopes(current_user["uid"])
+    scopes = await _get_granted_scopes(current_user.uid)
     return UserResponse(
         success=True,
-        user={**current_user, "scopes": scopes}
+        user={**asdict(current_user), "scopes": scopes}
     )
 
 
@@ -205,7 +180,7 @@ async def logout():
 
 @router.get("/validate")
 async def validate_token(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Validate if the current token is still valid.
@@ -218,15 +193,15 @@ async def validate_token(
     email worker observes Google's `invalid_grant` it stamps oauth_tokens
     .revoked_at, and we surface that to the frontend here.
     """
-    oauth_record = await _get_oauth_record(current_user["uid"])
+    oauth_record = await _get_oauth_record(current_user.uid)
     scope_str = oauth_record.get("scope") or oauth_record.get("scopes") or ""
     scopes = [s for s in scope_str.split() if s]
     revoked_at = oauth_record.get("revoked_at")
     return {
         "success": True,
         "valid": True,
-        "uid": current_user["uid"],
-        "email": current_user["email"],
+        "uid": current_user.uid,
+        "email": current_user.email,
         "scopes": scopes,
         "connectionStatus": "revoked" if revoked_at else "connected",
         "revokedAt": revoked_at,
@@ -245,41 +220,22 @@ async def gmail_access(request: GmailAccessRequest):
     
     Note: This endpoint doesn't require authentication since it's used for initial signup
     """
-    try:
-        # Generate a temporary state for new users
-        import uuid
-        temp_state = str(uuid.uuid4())
-        
-        # Build OAuth authorization URL
-        auth_params = {
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "redirect_uri": settings.OAUTH_REDIRECT_URI,
-            "response_type": "code",
-            "scope": GMAIL_OAUTH_SCOPES,
-            "access_type": "offline",
-            "prompt": "consent",
-            "state": temp_state  # Use temporary state for new users
-        }
-        
-        auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(auth_params)}"
-        
-        return GmailAccessResponse(
-            success=True,
-            auth_url=auth_url,
-            message="OAuth URL generated successfully"
-        )
-        
-    except Exception as e:
-        logger.error(f"Gmail access URL generation failed: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate Gmail access URL"
-        )
+    # Generate a temporary state for new users (hex is URL-safe as is)
+    temp_state = uuid.uuid4().hex
+    
+    # Build OAuth authorization URL
+    auth_url = f"{_AUTH_URL_PREFIX}&state={temp_state}"
+    
+    return GmailAccessResponse(
+        success=True,
+        auth_url=auth_url,
+        message="OAuth URL generated successfully"
+    )
 
 
 @router.post("/reauthorize")
 async def reauthorize(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Generate an OAuth URL that re-prompts Google for consent with the full
@@ -289,37 +245,78 @@ async def reauthorize(
     include_granted_scopes=true layers the new scope on top of anything the
     user has previously granted, so we don't lose existing grants.
     """
+    # Use the user's UID as the state so the callback can tie this back to them.
+    # (The callback looks up by Google's user ID from the token exchange, so state
+    # is informational here; we still include it for OAuth conformance.)
+    state = current_user.uid
+
+    auth_url = f"{_REAUTH_URL_PREFIX}&{urlencode({'state': state})}"
+
+    return {
+        "success": True,
+        "auth_url": auth_url,
+        "message": "Re-authorization URL generated",
+    }
+
+
+GOOGLE_ID_TOKEN_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+
+def _user_info_from_id_token(id_token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Read the user's identity from the OIDC id_token in Google's token response.
+
+    The id_token comes straight from Google's token endpoint over TLS, so per
+    OpenID Connect Core 3.1.3.7 TLS server validation stands in for the
+    signature check (no JWKS fetch); audience, issuer and expiry are still
+    verified. Returns the fields in the userinfo v2 shape, or None if there is
+    no usable id_token and the caller should fall back to the userinfo API.
+    """
+    if not id_token:
+        return None
     try:
-        # Use the user's UID as the state so the callback can tie this back to them.
-        # (The callback looks up by Google's user ID from the token exchange, so state
-        # is informational here; we still include it for OAuth conformance.)
-        state = current_user["uid"]
-
-        auth_params = {
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "redirect_uri": settings.OAUTH_REDIRECT_URI,
-            "response_type": "code",
-            "scope": GMAIL_OAUTH_SCOPES,
-            "access_type": "offline",
-            "prompt": "consent",
-            "include_granted_scopes": "true",
-            "state": state,
-        }
+        claims = jwt.decode(
+            id_token,
+            options={
+                "verify_signature": False,
+                "verify_aud": True,
+                "verify_iss": True,
+                "verify_exp": True,
+            },
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ID_TOKEN_ISSUERS,
+        )
+    except jwt.InvalidTokenError as e:
+        logger.warning(f"Ignoring unusable id_token: {e}")
+        return None
 
-        auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(auth_params)}"
+    if not claims.get("sub") or not claims.get("email"):
+        return None
 
-        return {
-            "success": True,
-            "auth_url": auth_url,
-            "message": "Re-authorization URL generated",
-        }
+    return {
+        "id": claims["sub"],
+        "email": claims["email"],
+        "verified_email": bool(claims.get("email_verified", False)),
+        "name": claims.get("name"),
+        "picture": claims.get("picture"),
+    }
 
-    except Exception as e:
-        logger.error(f"Re-authorization URL generation failed: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate re-authorization URL"
+
+async def _create_session_token(data_server, uid: str) -> Optional[str]:
+    """
+    Create a long-lived session token (30-day, stored in DB)
+
+    Best effort: the login still succeeds with just the JWT if this fails.
+    """
+    try:
+        session_resp = await data_server.post(
+            f"/api/storage/session-token/{uid}"
         )
+        if session_resp.is_success:
+            return orjson.loads(session_resp.content).get("data", {}).get("sessionToken")
+    except Exception as e:
+        logger.warning(f"Failed to create session token: {e}")
+    return None
 
 
 @router.post("/oauth-callback")
@@ -332,144 +329,173 @@ async def oauth_callback(request: OAuthCallbackRequest):
     2. Stores tokens in database via Data Server
     3. Creates/updates user session
     """
-    try:
-        # Exchange authorization code for tokens
-        token_data = {
-            "code": request.code,
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "client_secret": settings.GOOGLE_CLIENT_SECRET,
-            "redirect_uri": settings.OAUTH_REDIRECT_URI,
-            "grant_type": "authorization_code"
-        }
+    # Exchange authorization code for tokens
+    token_data = {
+        "code": request.code,
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "client_secret": settings.GOOGLE_CLIENT_SECRET,
+        "redirect_uri": settings.OAUTH_REDIRECT_URI,
+        "grant_type": "authorization_code"
+    }
+    
+    google = get_http_client()
+    data_server = get_data_server_client()
+    
+    # Exchange code for tokens
+    token_response = await google.post(
+        "https://oauth2.googleapis.com/token",
+        data=token_data
+    )
+    
+    if not token_response.is_success:
+        logger.error(f"Token exchange failed: {token_response.text}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange authorization code"
+        )
+    
+    tokens = orjson.loads(token_response.content)
+
+    # Reject if Gmail scope wasn't granted. Google's consent screen lets
+    # users uncheck individual permissions; without at least gmail.readonly
+    # the worker cannot read any email and the app is useless.
+    granted_scopes = set((tokens.get("scope") or "").split())
+    gmail_scopes = {
+        "https://www.googleapis.com/auth/gmail.readonly",
+        "https://www.googleapis.com/auth/gmail.modify",
+        "https://www.googleapis.com/auth/gmail.labels",
+        "https://mail.google.com/",
+    }
+    if not granted_scopes & gmail_scopes:
+        logger.warning(
+            f"OAuth callback rejected: no Gmail scope granted. "
+            f"Granted: {granted_scopes}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "code": "insufficient_gmail_scope",
+                "message": (
+                    "Gmail access was not granted. SubsBuzz needs permission "
+                    "to read your emails. Please sign in again and accept all "
+                    "permissions when prompted."
+                ),
+            },
+        )
+
+    # Get user info from the id_token when possible; otherwise ask Google
+    user_info = _user_info_from_id_token(tokens.get("id_token"))
+    if user_info is None:
+        user_info_response = await google.get(
+            "https://www.googleapis.com/oauth2/v2/userinfo",
+            headers={"Authorization": f"Bearer {tokens['access_token']}"}
+        )
         
-        async with httpx.AsyncClient() as client:
-            # Exchange code for tokens
-            token_response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data=token_data
-            )
-            
-            if not token_response.is_success:
-                logger.error(f"Token exchange failed: {token_response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to exchange authorization code"
-                )
-            
-            tokens = token_response.json()
-
-            # Reject if Gmail scope wasn't granted. Google's consent screen lets
-            # users uncheck individual permissions; without at least gmail.readonly
-            # the worker cannot read any email and the app is useless.
-            granted_scopes = set((tokens.get("scope") or "").split())
-            gmail_scopes = {
-                "https://www.googleapis.com/auth/gmail.readonly",
-                "https://www.googleapis.com/auth/gmail.modify",
-                "https://www.googleapis.com/auth/gmail.labels",
-                "https://mail.google.com/",
-            }
-            if not granted_scopes & gmail_scopes:
-                logger.warning(
-                    f"OAuth callback rejected: no Gmail scope granted. "
-                    f"Granted: {granted_scopes}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail={
-                        "code": "insufficient_gmail_scope",
-                        "message": (
-                            "Gmail access was not granted. SubsBuzz needs permission "
-                            "to read your emails. Please sign in again and accept all "
-                            "permissions when prompted."
-                        ),
-                    },
-                )
-
-            # Get user info from Google
-            user_info_response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {tokens['access_token']}"}
-            )
-            
-            if not user_info_response.is_success:
-                logger.error(f"User info fetch failed: {user_info_response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to fetch user information"
-                )
-            
-            user_info = user_info_response.json()
-            
-            # Store OAuth tokens in database via Data Server
-            # Use email as UID for new users (we'll use Google's user ID as the UID)
-            oauth_data = {
-                "uid": user_info["id"],  # Use Google's user ID as UID
-                "email": user_info["email"],
-                "accessToken": tokens["access_token"],
-                "refreshToken": tokens.get("refresh_token"),
-                "expiresAt": None,  # Will be calculated by Data Server
-                # Record the scope Google actually granted (users can de-select scopes
-                # on the consent screen), falling back to what we requested.
-                "scope": tokens.get("scope") or GMAIL_OAUTH_SCOPES,
-            }
-            
-            # Store tokens via Data Server
-            data_server_response = await client.post(
-                f"{settings.DATA_SERVER_URL}/api/storage/oauth-tokens",
-                json=oauth_data,
-                headers={"x-internal-api-key": settings.INTERNAL_API_SECRET}
+        if not user_info_response.is_success:
+            logger.error(f"User info fetch failed: {user_info_response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to fetch user information"
             )
-            
-            if not data_server_response.is_success:
-                logger.error(f"Token storage failed: {data_server_response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to store OAuth tokens"
-                )
-
-            # Create JWT token for user
-            uid = user_info["id"]
-            jwt_token = create_jwt_token({
-                "uid": uid,
-                "email": user_info["email"],
-                "email_verified": user_info.get("verified_email", False)
-            })
-
-            # Create a long-lived session token (30-day, stored in DB)
-            session_token = None
-            try:
-                session_resp = await client.post(
-                    f"{settings.DATA_SERVER_URL}/api/storage/session-token/{uid}",
-                    headers={"x-internal-api-key": settings.INTERNAL_API_SECRET}
-                )
-                if session_resp.is_success:
-                    session_token = session_resp.json().get("data", {}).get("sessionToken")
-            except Exception as e:
-                logger.warning(f"Failed to create session token: {e}")
-
-            return {
-                "success": True,
-                "message": "Gmail connected successfully",
-                "token": jwt_token,
-                "sessionToken": session_token,
-                "user": {
-                    "uid": uid,
-                    "email": user_info["email"],
-                    "name": user_info.get("name"),
-                    "picture": user_info.get("picture"),
-                    "email_verified": user_info.get("verified_email", False)
-                }
-            }
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"OAuth callback failed: {e}")
+        
+        user_info = orjson.loads(user_info_response.content)
+    
+    # Store OAuth tokens in database via Data Server
+    # Use email as UID for new users (we'll use Google's user ID as the UID)
+    oauth_data = {
+        "uid": user_info["id"],  # Use Google's user ID as UID
+        "email": user_info["email"],
+        "accessToken": tokens["access_token"],
+        "refreshToken": tokens.get("refresh_token"),
+        "expiresAt": None,  # Will be calculated by Data Server
+        # Record the scope Google actually granted (users can de-select scopes
+        # on the consent screen), falling back to what we requested.
+        "scope": tokens.get("scope") or GMAIL_OAUTH_SCOPES,
+    }
+    
+    # Store tokens via Data Server
+    data_server_response = await data_server.post(
+        "/api/storage/oauth-tokens",
+        content=orjson.dumps(oauth_data)
+    )
+    
+    if not data_server_response.is_success:
+        logger.error(f"Token storage failed: {data_server_response.text}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OAuth callback processing failed"
+            detail="Failed to store OAuth tokens"
         )
 
+    # Create JWT token for user, overlapped with creating the session
+    # token (which needs the OAuth row stored above, but not the JWT)
+    uid = user_info["id"]
+    jwt_token, session_token = await asyncio.gather(
+        run_jwt_crypto(create_jwt_token, {
+            "uid": uid,
+            "email": user_info["email"],
+            "email_verified": user_info.get("verified_email", False)
+        }),
+        _create_session_token(data_server, uid)
+    )
+
+    return {
+        "success": True,
+        "message": "Gmail connected successfully",
+        "token": jwt_token,
+        "sessionToken": session_token,
+        "user": {
+            "uid": uid,
+            "email": user_info["email"],
+            "name": user_info.get("name"),
+            "picture": user_info.get("picture"),
+            "email_verified": user_info.get("verified_email", False)
+        }
+    }
+
+
+def _js_string(value: str) -> str:
+    """Quote a value as a JS string literal that is safe inside <script>"""
+    return json.dumps(value).replace("<", "\\u003c")
+
+
+# Callback pages, rendered once at import. The success page only needs the
+# token substituted, as a quoted JS string literal (never raw interpolation).
+_CALLBACK_SUCCESS_HTML = f"""
+<html>
+<head><title>Gmail Connected</title></head>
+<body>
+<h1>Gmail Connected Successfully!</h1>
+<p>Redirecting to your dashboard...</p>
+<script>
+    localStorage.setItem('subsbuzz_token', {{TOKEN}});
+    window.location.href = {_js_string(settings.UI_URL + "?connected=gmail")};
+</script>
+</body>
+</html>
+""".encode()
+
+_CALLBACK_FAILED_HTML = f"""
+<html>
+<head><title>OAuth Error</title></head>
+<body>
+<h1>OAuth Error</h1>
+<p>Failed to connect Gmail account.</p>
+<p><a href="{html.escape(settings.UI_URL)}">Return to app</a></p>
+</body>
+</html>
+""".encode()
+
+_CALLBACK_ERROR_HTML = f"""
+<html>
+<head><title>OAuth Error</title></head>
+<body>
+<h1>OAuth Error</h1>
+<p>Failed to process OAuth callback: {{ERROR}}</p>
+<p><a href="{html.escape(settings.UI_URL)}">Return to app</a></p>
+</body>
+</html>
+""".encode()
+
 
 @router.get("/callback")
 async def oauth_callback_get(code: str, state: str):
@@ -486,53 +512,20 @@ async def oauth_callback_get(code: str, state: str):
         
         # If successful, redirect to frontend with success parameter and token
         if result.get("success"):
-            # Create a temporary token storage mechanism
-            # In a real implementation, you'd want to use secure httpOnly cookies
+            # The frontend reads the token from localStorage, so it is handed
+            # over by script rather than as an httpOnly cookie
             token = result.get("token", "")
             return HTMLResponse(
-                content=f"""
-                <html>
-                <head><title>Gmail Connected</title></head>
-                <body>
-                <h1>Gmail Connected Successfully!</h1>
-                <p>Redirecting to your dashboard...</p>
-                <script>
-                    localStorage.setItem('subsbuzz_token', '{token}');
-                    window.location.href = '{settings.UI_URL}?connected=gmail';
-                </script>
-                </body>
-                </html>
-                """,
+                content=_CALLBACK_SUCCESS_HTML.replace(b"{TOKEN}", _js_string(token).encode()),
                 status_code=200
             )
         else:
             # Show error page
-            return HTMLResponse(
-                content=f"""
-                <html>
-                <head><title>OAuth Error</title></head>
-                <body>
-                <h1>OAuth Error</h1>
-                <p>Failed to connect Gmail account.</p>
-                <p><a href="{settings.UI_URL}">Return to app</a></p>
-                </body>
-                </html>
-                """,
-                status_code=400
-            )
+            return HTMLResponse(content=_CALLBACK_FAILED_HTML, status_code=400)
     except Exception as e:
         logger.error(f"OAuth callback GET failed: {e}")
         # Return HTML response for browser redirect
         return HTMLResponse(
-            content=f"""
-            <html>
-            <head><title>OAuth Error</title></head>
-            <body>
-            <h1>OAuth Error</h1>
-            <p>Failed to process OAuth callback: {str(e)}</p>
-            <p><a href="{settings.UI_URL}">Return to app</a></p>
-            </body>
-            </html>
-            """,
+            content=_CALLBACK_ERROR_HTML.replace(b"{ERROR}", html.escape(str(e)).encode()),
             status_code=500
-        )
\ No newline at end of file
+        )
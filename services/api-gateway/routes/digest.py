@@ -2,17 +2,20 @@
 Digest routes for the API Gateway - proxies to Data Server
 """
 
+import asyncio
+import hashlib
 import logging
 from typing import Dict, Any, Optional, List
 
-import httpx
-from fastapi import APIRouter, HTTPException, Depends, Query, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 
-from auth import get_current_user
+from auth import CurrentUser, get_current_user
+from cache import digest_cache, get_redis
 from config import settings
-from auth import create_internal_api_headers
+from proxy import passthrough, proxy_raw_to_data_server, proxy_to_data_server
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -32,224 +35,162 @@ class DigestListResponse(BaseModel):
     total: Optional[int] = None
 
 
+# Emails are forwarded to the Data Server as-is and validated there, so the
+# gateway only checks for a list rather than walking every email dict
 class EmailDigestRequest(BaseModel):
     """Request model for creating email digests"""
-    emails: List[Dict[str, Any]]
+    emails: List[Any]
 
 
 class ThematicProcessRequest(BaseModel):
     """Request model for thematic processing"""
-    emails: List[Dict[str, Any]]
+    emails: List[Any]
     email_digest_id: Optional[int] = None
 
 
-# Helper function to proxy requests to Data Server
-async def proxy_to_data_server(
-    method: str,
-    path: str,
-    json_data: Optional[Dict] = None,
-    params: Optional[Dict] = None
-) -> Dict[str, Any]:
-    """Proxy request to Data Server with internal authentication"""
-    
-    url = f"{settings.DATA_SERVER_URL.rstrip('/')}/api/{path.lstrip('/')}"
-    headers = create_internal_api_headers()
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                json=json_data,
-                params=params,
-                headers=headers
-            )
-            
-            if response.status_code >= 400:
-                logger.error(f"Data Server error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.json().get("message", "Service error")
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        logger.error(f"Request error to Data Server: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail=f"Data Server unavailable: {str(e)}"
-        )
+async def cached_proxy_get(redis_client, user_id: str, field: str, path: str,
+                           ttl: int = settings.DIGEST_CACHE_TTL,
+                           params: Optional[Dict] = None) -> bytes:
+    """GET through the per-user digest cache, returning the raw body"""
+    return await digest_cache.get_or_load(
+        redis_client, user_id, field, ttl,
+        lambda: proxy_raw_to_data_server("GET", path, params=params)
+    )
+
 
+def conditional_response(request: Request, body: bytes) -> Response:
+    """
+    JSON response with an ETag, or a bodiless 304 if the client has it
+
+    `no-cache` makes browsers revalidate on every use, so polling clients
+    get a 304 instead of the full body whenever nothing changed.
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@router.get("/latest", response_model=DigestResponse)
+
+@router.get("/latest", responses={200: {"model": DigestResponse}})
 async def get_latest_digest(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Get the latest digest for the current user
     
     Prioritizes thematic digests, falls back to regular digests
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"digest/latest/{user_id}"
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting latest digest: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve latest digest"
-        )
+    body = await cached_proxy_get(
+        redis_client, user_id, "latest",
+        f"digest/latest/{user_id}"
+    )
+    
+    return passthrough(body)
 
 
-@router.get("/detailed", response_model=DigestResponse)
+@router.get("/detailed", responses={200: {"model": DigestResponse}})
 async def get_detailed_digest(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Get the latest detailed digest (individual emails) for the current user
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"digest/detailed/{user_id}"
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting detailed digest: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve detailed digest"
-        )
+    body = await cached_proxy_get(
+        redis_client, user_id, "detailed",
+        f"digest/detailed/{user_id}"
+    )
+    
+    return passthrough(body)
 
 
-@router.get("/history", response_model=DigestListResponse)
+@router.get("/history", responses={200: {"model": DigestListResponse}})
 async def get_digest_history(
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis),
     limit: Optional[int] = Query(None, description="Number of digests to return"),
     offset: Optional[int] = Query(None, description="Number of digests to skip")
 ):
     """
     Get digest history for the current user
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        params = {}
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
-        
-        result = await proxy_to_data_server(
-            "GET",
-            f"digest/history/{user_id}",
-            params=params
-        )
-        
-        return DigestListResponse(
-            success=True,
-            data=result.get("data", {}),
-            total=result.get("data", {}).get("total")
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting digest history: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve digest history"
-        )
+    params = {}
+    if limit is not None:
+        params["limit"] = limit
+    if offset is not None:
+        params["offset"] = offset
+    
+    # Short TTL: the history page polls this while a digest is generated
+    result = orjson.loads(await cached_proxy_get(
+        redis_client, user_id, f"history:{limit}:{offset}",
+        f"digest/history/{user_id}",
+        ttl=settings.DIGEST_HISTORY_CACHE_TTL,
+        params=params
+    ))
+    
+    data = result.get("data", {})
+    return conditional_response(request, orjson.dumps({
+        "success": True,
+        "data": data,
+        "total": data.get("total")
+    }))
 
 
-@router.get("/date/{date}", response_model=DigestResponse)
+@router.get("/date/{date}", responses={200: {"model": DigestResponse}})
 async def get_digest_by_date(
     date: str,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Get digest for a specific date (YYYY-MM-DD format)
     
     Returns thematic digest if available, otherwise regular digest
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"digest/date/{user_id}/{date}"
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting digest by date: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve digest for date"
-        )
+    body = await cached_proxy_get(
+        redis_client, user_id, f"date:{date}",
+        f"digest/date/{user_id}/{date}"
+    )
+    
+    return passthrough(body)
 
 
-@router.post("/create", response_model=DigestResponse)
+@router.post("/create", responses={200: {"model": DigestResponse}})
 async def create_digest(
     request: EmailDigestRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Create a new digest from provided emails
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "POST",
-            "digest/create",
-            json_data={
-                "user_id": user_id,
-                "emails": request.emails
-            }
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error creating digest: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create digest"
-        )
+    result = await proxy_to_data_server(
+        "POST",
+        "digest/create",
+        json_data={
+            "user_id": user_id,
+            "emails": request.emails
+        }
+    )
+    await digest_cache.invalidate(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
 class GenerateDigestRequest(BaseModel):
@@ -258,141 +199,156 @@ class GenerateDigestRequest(BaseModel):
     force: bool = False
 
 
-@router.post("/generate", response_model=DigestResponse)
+@router.post("/generate", responses={200: {"model": DigestResponse}})
 async def generate_digest(
     body: GenerateDigestRequest = GenerateDigestRequest(),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis),
 ):
     """
     Generate a new digest automatically by fetching recent emails
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
 
-    try:
-        result = await proxy_to_data_server(
-            "POST",
-            "digest/generate",
-            json_data={
-                "user_id": user_id,
-                "force": body.force,
-            }
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error generating digest: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate digest"
-        )
+    result = await proxy_to_data_server(
+        "POST",
+        "digest/generate",
+        json_data={
+            "user_id": user_id,
+            "force": body.force,
+        }
+    )
+    await digest_cache.invalidate(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
-@router.post("/thematic/process", response_model=DigestResponse)
+@router.post("/thematic/process", responses={200: {"model": DigestResponse}})
 async def process_thematic_digest(
     request: ThematicProcessRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Process emails into a thematic digest using AI analysis
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "POST",
-            "digest/thematic/process",
-            json_data={
-                "userId": user_id,
-                "emails": request.emails,
-                "emailDigestId": request.email_digest_id
-            }
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing thematic digest: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to process thematic digest"
-        )
+    result = await proxy_to_data_server(
+        "POST",
+        "digest/thematic/process",
+        json_data={
+            "userId": user_id,
+            "emails": request.emails,
+            "emailDigestId": request.email_digest_id
+        }
+    )
+    await digest_cache.invalidate(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
-@router.get("/stats", response_model=DigestResponse)
+@router.get("/stats", responses={200: {"model": DigestResponse}})
 async def get_digest_stats(
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     period: Optional[str] = Query(None, description="Time period: day, week, month, year")
 ):
     """
     Get digest statistics for the current user
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        params = {}
-        if period:
-            params["period"] = period
-        
-        result = await proxy_to_data_server(
-            "GET",
-            f"digest/stats/{user_id}",
-            params=params
-        )
-        
-        return DigestResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting digest stats: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve digest statistics"
-        )
+    params = {}
+    if period:
+        params["period"] = period
+    
+    body = await proxy_raw_to_data_server(
+        "GET",
+        f"digest/stats/{user_id}",
+        params=params
+    )
+    
+    return passthrough(body)
 
 
-@router.get("/available-dates", response_model=DigestResponse)
+@router.get("/available-dates", responses={200: {"model": DigestResponse}})
 async def get_available_digest_dates(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Get all dates that have digests available for the current user
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
+    
+    result = orjson.loads(await cached_proxy_get(
+        redis_client, user_id, "available-dates",
+        f"storage/available-digest-dates/{user_id}",
+        ttl=settings.DIGEST_DATES_CACHE_TTL
+    ))
     
+    return conditional_response(request, orjson.dumps({
+        "success": True,
+        "data": {"dates": result.get("data", [])}
+    }))
+
+
+async def _unless_missing(read) -> Optional[bytes]:
+    """Await a Data Server read, mapping "not found" to None"""
     try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"storage/available-digest-dates/{user_id}"
-        )
-        
-        return DigestResponse(
-            success=True,
-            data={"dates": result.get("data", [])}
-        )
-        
-    except HTTPException:
+        return await read
+    except HTTPException as e:
+        if e.status_code == status.HTTP_404_NOT_FOUND:
+            return None
         raise
-    except Exception as e:
-        logger.error(f"Error getting available digest dates: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve available digest dates"
+
+
+@router.get("/bootstrap", responses={200: {"model": DigestResponse}})
+async def get_dashboard_bootstrap(
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
+):
+    """
+    Get everything the dashboard loads on open in one call
+
+    Returns the latest digest, the latest detailed digest and the available
+    digest dates. The three reads go to the Data Server concurrently (and
+    through the digest cache), so this costs one round trip instead of three.
+    `latest` and `detailed` are null for a user with no digests yet.
+    """
+    user_id = current_user.uid
+    
+    latest, detailed, dates = await asyncio.gather(
+        _unless_missing(cached_proxy_get(
+            redis_client, user_id, "latest",
+            f"digest/latest/{user_id}"
+        )),
+        _unless_missing(cached_proxy_get(
+            redis_client, user_id, "detailed",
+            f"digest/detailed/{user_id}"
+        )),
+        cached_proxy_get(
+            redis_client, user_id, "available-dates",
+            f"storage/available-digest-dates/{user_id}",
+            ttl=settings.DIGEST_DATES_CACHE_TTL
         )
+    )
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": {
+            "latest": orjson.loads(latest).get("data") if latest else None,
+            "detailed": orjson.loads(detailed).get("data") if detailed else None,
+            "dates": orjson.loads(dates).get("data", [])
+        }
+    })
 
 
 @router.get("/by-category/{slug}")
@@ -400,42 +356,42 @@ async def get_digest_emails_by_category(
     slug: str,
     limit: int = Query(50, ge=1, le=200),
     before: Optional[str] = Query(None, description="ISO-8601 timestamp for cursor pagination"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Return digest_emails (articles) matching a category slug for the current user.
     Covers both rename (FK resolves current name) and delete (snapshot slug match)
     cases on the data-server side.
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     params: Dict[str, Any] = {"limit": limit}
     if before:
         params["before"] = before
 
-    result = await proxy_to_data_server(
+    body = await proxy_raw_to_data_server(
         "GET",
         f"storage/digests/by-category/{user_id}/{slug}",
         params=params,
     )
-    # data is a list of digest_emails — JSONResponse avoids Pydantic rejecting
+    # data is a list of digest_emails — a direct response avoids Pydantic rejecting
     # a list assigned to DigestResponse.data: Dict[str, Any]
-    return JSONResponse({"success": True, "data": result.get("data", [])})
+    return passthrough(body)
 
 
 @router.get("/by-tag/{slug}")
 async def get_digest_emails_by_tag(
     slug: str,
     limit: int = Query(100, ge=1, le=200),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Return every digest_email tagged with the given slug for the current user,
     plus tag metadata (displayName, usageCount). Backs the /tags/:slug page.
     """
-    user_id = current_user["uid"]
-    result = await proxy_to_data_server(
+    user_id = current_user.uid
+    body = await proxy_raw_to_data_server(
         "GET",
         f"storage/digests/by-tag/{user_id}/{slug}",
         params={"limit": limit},
     )
-    return JSONResponse({"success": True, "data": result.get("data", {})})
\ No newline at end of file
+    return passthrough(body)
\ No newline at end of file
@@ -9,12 +9,13 @@ after create so /category/:slug URLs never 404 on rename.
 import logging
 from typing import Any, Dict, Optional
 
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
-from auth import create_internal_api_headers, get_current_user
-from config import settings
+from auth import CurrentUser, get_current_user
+from cache import digest_cache, get_redis
+from proxy import proxy_to_data_server
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -37,60 +38,37 @@ class UpdateCategoryRequest(BaseModel):
     sortOrder: Optional[int] = None
 
 
-async def proxy_to_data_server(
-    method: str,
-    path: str,
-    json_data: Optional[Dict] = None,
-    params: Optional[Dict] = None,
-) -> Dict[str, Any]:
-    url = f"{settings.DATA_SERVER_URL.rstrip('/')}/api/{path.lstrip('/')}"
-    headers = create_internal_api_headers()
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(method, url, json=json_data, params=params, headers=headers)
-            if response.status_code >= 400:
-                # Surface data-server error codes (409 DUPLICATE, 400 INVALID_CATEGORY, etc.)
-                try:
-                    payload = response.json()
-                    detail = payload.get("error") or payload.get("message") or "Service error"
-                except Exception:
-                    detail = response.text or "Service error"
-                raise HTTPException(status_code=response.status_code, detail=detail)
-            return response.json()
-    except httpx.RequestError as e:
-        logger.error(f"Data Server request failed: {e}")
-        raise HTTPException(status_code=503, detail=f"Data Server unavailable: {str(e)}")
-
-
-@router.get("", response_model=CategoryResponse)
-async def list_categories(current_user: Dict[str, Any] = Depends(get_current_user)):
-    user_id = current_user["uid"]
+@router.get("", responses={200: {"model": CategoryResponse}})
+async def list_categories(current_user: CurrentUser = Depends(get_current_user)):
+    user_id = current_user.uid
     result = await proxy_to_data_server("GET", f"storage/email-categories/{user_id}")
-    return CategoryResponse(success=True, data=result.get("data", []))
+    return ORJSONResponse({"success": True, "data": result.get("data", [])})
 
 
-@router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+@router.post("", status_code=status.HTTP_201_CREATED,
+              responses={201: {"model": CategoryResponse}})
 async def create_category(
     request: CreateCategoryRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     payload: Dict[str, Any] = {"userId": user_id, "name": request.name}
     if request.color is not None:
         payload["color"] = request.color
     if request.sortOrder is not None:
         payload["sortOrder"] = request.sortOrder
     result = await proxy_to_data_server("POST", "storage/email-categories", json_data=payload)
-    return CategoryResponse(success=True, data=result.get("data", {}))
+    return ORJSONResponse({"success": True, "data": result.get("data", {})})
 
 
-@router.patch("/{category_id}", response_model=CategoryResponse)
+@router.patch("/{category_id}", responses={200: {"model": CategoryResponse}})
 async def update_category(
     category_id: int,
     request: UpdateCategoryRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis),
 ):
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     # Ownership is enforced server-side: the data-server scopes the UPDATE by
     # (id, userId) and returns 404 if the row doesn't belong to this user.
     payload: Dict[str, Any] = {"userId": user_id}
@@ -101,18 +79,23 @@ async def update_category(
     if request.sortOrder is not None:
         payload["sortOrder"] = request.sortOrder
     result = await proxy_to_data_server("PATCH", f"storage/email-categories/{category_id}", json_data=payload)
-    return CategoryResponse(success=True, data=result.get("data", {}))
+    # Digest articles show category names, so cached digests are stale now
+    await digest_cache.invalidate(redis_client, user_id)
+    return ORJSONResponse({"success": True, "data": result.get("data", {})})
 
 
-@router.delete("/{category_id}", response_model=CategoryResponse)
+@router.delete("/{category_id}", responses={200: {"model": CategoryResponse}})
 async def delete_category(
     category_id: int,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis),
 ):
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     await proxy_to_data_server(
         "DELETE",
         f"storage/email-categories/{category_id}",
         json_data={"userId": user_id},
     )
-    return CategoryResponse(success=True, data=None)
+    # Digest articles show category names, so cached digests are stale now
+    await digest_cache.invalidate(redis_client, user_id)
+    return ORJSONResponse({"success": True, "data": None})
@@ -11,7 +11,7 @@ from typing import Dict, Any
 from celery import Celery
 from fastapi import APIRouter, HTTPException, Depends
 
-from auth import get_current_user
+from auth import CurrentUser, get_current_user
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -25,7 +25,7 @@ _celery = Celery(broker=settings.REDIS_URL, backend=settings.REDIS_URL)
 @router.post("/{message_id}/archive")
 async def archive_email(
     message_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
     Archive a Gmail message for the current user.
@@ -36,7 +36,7 @@ async def archive_email(
     Path param:
       message_id — the raw Gmail message ID (last segment of the Gmail URL after #inbox/)
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
 
     try:
         task = _celery.send_task(
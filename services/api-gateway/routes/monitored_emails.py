@@ -5,13 +5,12 @@ Monitored emails routes for the API Gateway - proxies to Data Server
 import logging
 from typing import Dict, Any, List, Optional
 
-import httpx
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, EmailStr
 
-from auth import get_current_user
-from config import settings
-from auth import create_internal_api_headers
+from auth import CurrentUser, get_current_user
+from proxy import passthrough, proxy_raw_to_data_server, proxy_to_data_server
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -55,161 +54,90 @@ class BulkAddResponse(BaseModel):
     data: Any
 
 
-# Helper function to proxy requests to Data Server
-async def proxy_to_data_server(
-    method: str,
-    path: str,
-    json_data: Dict = None,
-    params: Dict = None
-) -> Dict[str, Any]:
-    """Proxy request to Data Server with internal authentication"""
-    
-    url = f"{settings.DATA_SERVER_URL.rstrip('/')}/api/{path.lstrip('/')}"
-    headers = create_internal_api_headers()
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                json=json_data,
-                params=params,
-                headers=headers
-            )
-            
-            if response.status_code >= 400:
-                logger.error(f"Data Server error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.json().get("message", "Service error")
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        logger.error(f"Request error to Data Server: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail=f"Data Server unavailable: {str(e)}"
-        )
-
-
-@router.get("", response_model=MonitoredEmailResponse)
+@router.get("", responses={200: {"model": MonitoredEmailResponse}})
 async def get_monitored_emails(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get all monitored emails for the current user
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"storage/monitored-emails/{user_id}"
-        )
-        
-        return MonitoredEmailResponse(
-            success=True,
-            data=result.get("data", [])
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting monitored emails: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve monitored emails"
-        )
+    body = await proxy_raw_to_data_server(
+        "GET",
+        f"storage/monitored-emails/{user_id}"
+    )
+    
+    return passthrough(body)
 
 
-@router.post("", response_model=MonitoredEmailResponse)
+@router.post("", responses={200: {"model": MonitoredEmailResponse}})
 async def add_monitored_email(
     request: MonitoredEmailRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Add a new monitored email for the current user
     """
-    user_id = current_user["uid"]
-
-    try:
-        payload: Dict[str, Any] = {
-            "userId": user_id,
-            "email": str(request.email),
-            "active": request.active,
-        }
-        if request.categoryId is not None:
-            payload["categoryId"] = request.categoryId
-
-        result = await proxy_to_data_server(
-            "POST",
-            "storage/monitored-emails",
-            json_data=payload
-        )
+    user_id = current_user.uid
 
-        return MonitoredEmailResponse(
-            success=True,
-            data=result.get("data", {})
-        )
+    payload: Dict[str, Any] = {
+        "userId": user_id,
+        "email": str(request.email),
+        "active": request.active,
+    }
+    if request.categoryId is not None:
+        payload["categoryId"] = request.categoryId
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error adding monitored email: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to add monitored email"
-        )
+    result = await proxy_to_data_server(
+        "POST",
+        "storage/monitored-emails",
+        json_data=payload
+    )
 
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
-@router.post("/bulk", response_model=BulkAddResponse)
+
+@router.post("/bulk", responses={200: {"model": BulkAddResponse}})
 async def bulk_add_monitored_emails(
     request: BulkAddRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Bulk-add monitored emails (TEEPER-208 onboarding wizard).
     Senders that already exist for the user are silently skipped — only
     newly-inserted rows are returned in `data.items`.
     """
-    user_id = current_user["uid"]
-    try:
-        payload = {
-            "userId": user_id,
-            "items": [
-                {"email": str(i.email), "active": i.active, "categoryId": i.categoryId}
-                for i in request.items
-            ],
-        }
-        result = await proxy_to_data_server(
-            "POST",
-            "storage/monitored-emails/bulk",
-            json_data=payload,
-        )
-        return BulkAddResponse(success=True, data=result.get("data", {}))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error bulk-adding monitored emails: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to bulk-add monitored emails",
-        )
+    user_id = current_user.uid
+    payload = {
+        "userId": user_id,
+        "items": [
+            {"email": str(i.email), "active": i.active, "categoryId": i.categoryId}
+            for i in request.items
+        ],
+    }
+    result = await proxy_to_data_server(
+        "POST",
+        "storage/monitored-emails/bulk",
+        json_data=payload,
+    )
+    return ORJSONResponse({"success": True, "data": result.get("data", {})})
 
 
-@router.patch("/{email_id}", response_model=MonitoredEmailResponse)
+@router.patch("/{email_id}", responses={200: {"model": MonitoredEmailResponse}})
 async def update_monitored_email(
     email_id: int,
     request: MonitoredEmailUpdate,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Update a monitored email (toggle active / reassign category) for the current user.
     Ownership is enforced on the data-server side (scoped UPDATE returns 404 otherwise).
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
 
     payload: Dict[str, Any] = {"userId": user_id}
     if request.active is not None:
@@ -222,94 +150,76 @@ async def update_monitored_email(
         f"storage/monitored-emails/{email_id}",
         json_data=payload
     )
-    return MonitoredEmailResponse(success=True, data=result.get("data", {}))
+    return ORJSONResponse({"success": True, "data": result.get("data", {})})
 
 
-@router.get("/{email_id}", response_model=MonitoredEmailResponse)
+@router.get("/{email_id}", responses={200: {"model": MonitoredEmailResponse}})
 async def get_monitored_email(
     email_id: int,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get a specific monitored email by ID
     """
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"storage/monitored-email/{email_id}"
-        )
-        
-        # Verify the email belongs to the current user
-        email_data = result.get("data", {})
-        if email_data.get("userId") != current_user["uid"]:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Monitored email not found"
-            )
-        
-        return MonitoredEmailResponse(
-            success=True,
-            data=email_data
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting monitored email: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve monitored email"
-        )
+    # Scoped read: the Data Server 404s if the email belongs to someone else
+    body = await proxy_raw_to_data_server(
+        "GET",
+        f"storage/monitored-emails/{current_user.uid}/{email_id}"
+    )
+    
+    return passthrough(body)
 
 
-@router.delete("/{email_id}", response_model=MonitoredEmailResponse)
+@router.delete("/{email_id}", responses={200: {"model": MonitoredEmailResponse}})
 async def remove_monitored_email(
     email_id: int,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Remove a monitored email for the current user
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        # First verify the email belongs to the user
-        email_result = await proxy_to_data_server(
-            "GET",
-            f"storage/monitored-email/{email_id}"
-        )
-        
-        email_data = email_result.get("data", {})
-        if email_data.get("userId") != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Monitored email not found"
-            )
-        
-        # Remove the email
-        await proxy_to_data_server(
-            "DELETE",
-            f"storage/monitored-emails/{user_id}/{email_id}"
-        )
-        
-        return MonitoredEmailResponse(
-            success=True,
-            data={"message": "Monitored email removed successfully"}
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error removing monitored email: {e}")
+    # Scoped delete: the Data Server 404s if the email isn't the user's
+    await proxy_to_data_server(
+        "DELETE",
+        f"storage/monitored-emails/{user_id}/{email_id}"
+    )
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": {"message": "Monitored email removed successfully"}
+    })
+
+
+async def get_active_monitored_emails(
+    current_user: CurrentUser = Depends(get_current_user)
+) -> List[str]:
+    """
+    Addresses of the current user's active monitored emails
+
+    Depends on get_current_user, so an unauthenticated request is rejected
+    before the Data Server is queried. Raises 400 if the user has no
+    monitored emails at all.
+    """
+    result = await proxy_to_data_server(
+        "GET",
+        f"storage/monitored-emails/{current_user.uid}"
+    )
+    monitored_emails = result.get("data", [])
+
+    if not monitored_emails:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to remove monitored email"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No monitored emails configured. Please add email addresses to monitor first."
         )
+    return [email["email"] for email in monitored_emails if email.get("active")]
 
 
 @router.post("/trigger-digest")
 async def trigger_digest_generation(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    monitored_emails: List[str] = Depends(get_active_monitored_emails)
 ):
     """
     Manually trigger digest generation for the current user
@@ -318,42 +228,16 @@ async def trigger_digest_generation(
     for the current user immediately, rather than waiting for the
     scheduled daily digest generation.
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        # Get user's monitored emails first
-        monitored_emails_result = await proxy_to_data_server(
-            "GET",
-            f"storage/monitored-emails/{user_id}"
-        )
-        
-        monitored_emails = monitored_emails_result.get("data", [])
-        
-        if not monitored_emails:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No monitored emails configured. Please add email addresses to monitor first."
-            )
-        
-        # Trigger digest generation via Data Server
-        result = await proxy_to_data_server(
-            "POST",
-            f"digest/generate/{user_id}",
-            json_data={
-                "monitored_emails": [email["email"] for email in monitored_emails if email.get("active")]
-            }
-        )
-        
-        return MonitoredEmailResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error triggering digest generation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to trigger digest generation"
-        )
\ No newline at end of file
+    # Trigger digest generation via Data Server
+    result = await proxy_to_data_server(
+        "POST",
+        f"digest/generate/{user_id}",
+        json_data={"monitored_emails": monitored_emails}
+    )
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
\ No newline at end of file
@@ -12,7 +12,7 @@ from celery import Celery
 from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, HTTPException
 
-from auth import get_current_user
+from auth import CurrentUser, get_current_user
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,12 +24,12 @@ _celery = Celery(broker=settings.REDIS_URL, backend=settings.REDIS_URL)
 
 
 @router.post("/scan")
-async def kick_off_scan(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+async def kick_off_scan(current_user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Kick off a newsletter scan over the current user's last 72h of Gmail.
     Returns a task_id immediately; poll GET /scan/{task_id} for the result.
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     try:
         task = _celery.send_task(
             "tasks.scan_for_newsletters",
@@ -46,7 +46,7 @@ async def kick_off_scan(current_user: Dict[str, Any] = Depends(get_current_user)
 @router.get("/scan/{task_id}")
 async def get_scan_result(
     task_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
     Fetch the status / result of a previously-dispatched scan. The response
@@ -3,15 +3,17 @@ User settings routes for the API Gateway - proxies to Data Server
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional
 
-import httpx
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-from auth import get_current_user
+from auth import CurrentUser, get_current_user
+from cache import get_redis, settings_cache
 from config import settings
-from auth import create_internal_api_headers
+from proxy import proxy_raw_to_data_server, proxy_to_data_server
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -73,6 +75,10 @@ LLM_PROVIDERS = {"deepseek", "openai"}
 # Providers whose API key is user-supplied (as opposed to server-managed).
 USER_KEYED_PROVIDERS = {"openai"}
 
+# Accepted by PATCH /preferences/theme; FastAPI validates these at parse time
+ThemeMode = Literal["light", "dark", "system"]
+ThemeColor = Literal["blue", "green", "purple", "orange", "red", "gray"]
+
 
 class ApiKeyRequest(BaseModel):
     apiKey: str
@@ -82,48 +88,19 @@ class ApiKeyRequest(BaseModel):
     provider: Optional[str] = None
 
 
-# Helper function to proxy requests to Data Server
-async def proxy_to_data_server(
-    method: str,
-    path: str,
-    json_data: Dict = None,
-    params: Dict = None
-) -> Dict[str, Any]:
-    """Proxy request to Data Server with internal authentication"""
-    
-    url = f"{settings.DATA_SERVER_URL.rstrip('/')}/api/{path.lstrip('/')}"
-    headers = create_internal_api_headers()
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                json=json_data,
-                params=params,
-                headers=headers
-            )
-            
-            if response.status_code >= 400:
-                logger.error(f"Data Server error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.json().get("message", "Service error")
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        logger.error(f"Request error to Data Server: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail=f"Data Server unavailable: {str(e)}"
-        )
+async def fetch_user_settings(redis_client, user_id: str) -> Dict[str, Any]:
+    """User settings from the Data Server, through the settings cache"""
+    body = await settings_cache.get_or_load(
+        redis_client, user_id, "user-settings", settings.SETTINGS_CACHE_TTL,
+        lambda: proxy_raw_to_data_server("GET", f"storage/user-settings/{user_id}")
+    )
+    return orjson.loads(body)
 
 
-@router.get("", response_model=SettingsResponse)
+@router.get("", responses={200: {"model": SettingsResponse}})
 async def get_user_settings(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Get user settings for the current user
@@ -134,33 +111,21 @@ async def get_user_settings(
     - Email notification settings
     - Theme preferences
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"storage/user-settings/{user_id}"
-        )
-        
-        return SettingsResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting user settings: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve user settings"
-        )
+    result = await fetch_user_settings(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
-@router.patch("", response_model=SettingsResponse)
+@router.patch("", responses={200: {"model": SettingsResponse}})
 async def update_user_settings(
     request: SettingsUpdateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Update user settings for the current user
@@ -168,11 +133,11 @@ async def update_user_settings(
     Only provided fields will be updated. Fields not included
     in the request will remain unchanged.
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
     # Convert request to dict, excluding None values
     update_data = {
-        key: value for key, value in request.dict().items()
+        key: value for key, value in request.model_dump().items()
         if value is not None
     }
 
@@ -206,31 +171,23 @@ async def update_user_settings(
                 )
             )
 
-    try:
-        result = await proxy_to_data_server(
-            "PATCH",
-            f"storage/user-settings/{user_id}",
-            json_data=update_data
-        )
-        
-        return SettingsResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating user settings: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update user settings"
-        )
+    result = await proxy_to_data_server(
+        "PATCH",
+        f"storage/user-settings/{user_id}",
+        json_data=update_data
+    )
+    await settings_cache.invalidate(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
 @router.post("/reset")
 async def reset_user_settings(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Reset user settings to default values
@@ -242,7 +199,7 @@ async def reset_user_settings(
     - Theme mode: "system"
     - Theme color: "blue"
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
     default_settings = {
         "dailyDigestEnabled": True,
@@ -252,100 +209,65 @@ async def reset_user_settings(
         "themeColor": "blue"
     }
     
-    try:
-        result = await proxy_to_data_server(
-            "PATCH",
-            f"storage/user-settings/{user_id}",
-            json_data=default_settings
-        )
-        
-        return SettingsResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error resetting user settings: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to reset user settings"
-        )
+    result = await proxy_to_data_server(
+        "PATCH",
+        f"storage/user-settings/{user_id}",
+        json_data=default_settings
+    )
+    await settings_cache.invalidate(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
 @router.get("/preferences/theme")
 async def get_theme_preferences(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Get theme-specific preferences for the current user
     
     Returns only theme-related settings for faster loading
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"storage/user-settings/{user_id}"
-        )
-        
-        settings_data = result.get("data", {})
-        theme_preferences = {
-            "themeMode": settings_data.get("themeMode", "system"),
-            "themeColor": settings_data.get("themeColor", "blue")
-        }
-        
-        return SettingsResponse(
-            success=True,
-            data=theme_preferences
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting theme preferences: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve theme preferences"
-        )
+    result = await fetch_user_settings(redis_client, user_id)
+    
+    settings_data = result.get("data", {})
+    theme_preferences = {
+        "themeMode": settings_data.get("themeMode", "system"),
+        "themeColor": settings_data.get("themeColor", "blue")
+    }
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": theme_preferences
+    })
 
 
 @router.patch("/preferences/theme")
 async def update_theme_preferences(
-    themeMode: Optional[str] = None,
-    themeColor: Optional[str] = None,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    themeMode: Optional[ThemeMode] = None,
+    themeColor: Optional[ThemeColor] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """
     Update only theme preferences for the current user
     
     Quick endpoint for updating theme settings without affecting
-    other user preferences.
+    other user preferences. Invalid values are rejected with a 422
+    before the handler runs.
     """
-    user_id = current_user["uid"]
-    
-    # Validate theme values
-    valid_theme_modes = ["light", "dark", "system"]
-    valid_theme_colors = ["blue", "green", "purple", "orange", "red", "gray"]
+    user_id = current_user.uid
     
     update_data = {}
-    
     if themeMode is not None:
-        if themeMode not in valid_theme_modes:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid theme mode. Must be one of: {', '.join(valid_theme_modes)}"
-            )
         update_data["themeMode"] = themeMode
-    
     if themeColor is not None:
-        if themeColor not in valid_theme_colors:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid theme color. Must be one of: {', '.join(valid_theme_colors)}"
-            )
         update_data["themeColor"] = themeColor
     
     if not update_data:
@@ -354,32 +276,23 @@ async def update_theme_preferences(
             detail="No theme preferences provided for update"
         )
     
-    try:
-        result = await proxy_to_data_server(
-            "PATCH",
-            f"storage/user-settings/{user_id}",
-            json_data=update_data
-        )
-        
-        return SettingsResponse(
-            success=True,
-            data=result.get("data", {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating theme preferences: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update theme preferences"
-        )
+    result = await proxy_to_data_server(
+        "PATCH",
+        f"storage/user-settings/{user_id}",
+        json_data=update_data
+    )
+    await settings_cache.invalidate(redis_client, user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "data": result.get("data", {})
+    })
 
 
 @router.get("/test-api-key")
 async def test_api_key(
     provider: Optional[str] = None,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Test whether the selected provider's API key is valid.
 
@@ -387,7 +300,7 @@ async def test_api_key(
     for backward compatibility with the existing UI. 'deepseek' tests the
     server-managed shared key.
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     provider = provider or "openai"
     if provider not in LLM_PROVIDERS:
         raise HTTPException(
@@ -397,26 +310,18 @@ async def test_api_key(
                 f"Must be one of: {', '.join(sorted(LLM_PROVIDERS))}"
             )
         )
-    try:
-        result = await proxy_to_data_server(
-            "GET",
-            f"digest/openai-health?userId={user_id}&provider={provider}"
-        )
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error testing API key: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to test API key"
-        )
+    result = await proxy_to_data_server(
+        "GET",
+        f"digest/openai-health?userId={user_id}&provider={provider}"
+    )
+    return result
 
 
 @router.post("/api-key")
 async def update_api_key(
     request: ApiKeyRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    redis_client=Depends(get_redis)
 ):
     """Store a user-supplied provider API key.
 
@@ -425,7 +330,7 @@ async def update_api_key(
     server-side key, never a user key. The legacy `{ apiKey }` body shape
     (no `provider` field) is accepted and defaults to 'openai'.
     """
-    user_id = current_user["uid"]
+    user_id = current_user.uid
     provider = request.provider or "openai"
     if provider not in USER_KEYED_PROVIDERS:
         raise HTTPException(
@@ -440,19 +345,10 @@ async def update_api_key(
     # payload to the right column here (e.g. anthropicApiKey, geminiApiKey).
     payload = {"openaiApiKey": request.apiKey}
 
-    try:
-        await proxy_to_data_server(
-            "PATCH",
-            f"storage/user-settings/{user_id}",
-            json_data=payload
-        )
-        return {"success": True, "message": "API key updated"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating API key: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update API key"
-        )
\ No newline at end of file
+    await proxy_to_data_server(
+        "PATCH",
+        f"storage/user-settings/{user_id}",
+        json_data=payload
+    )
+    await settings_cache.invalidate(redis_client, user_id)
+    return {"success": True, "message": "API key updated"}
\ No newline at end of file
@@ -69,6 +69,22 @@ router.get('/monitored-email/:id', asyncHandler(async (req: Request, res: Respon
   return res.json(apiResponse(monitoredEmail));
 }));
 
+// Get a monitored email owned by a user (404 if it belongs to someone else)
+router.get('/monitored-emails/:userId/:id', asyncHandler(async (req: Request, res: Response) => {
+  const { userId } = req.params;
+  const id = parseInt(req.params.id);
+  if (isNaN(id)) {
+    return res.status(400).json(apiError('Invalid ID', 'INVALID_ID'));
+  }
+
+  const monitoredEmail = await storage.getMonitoredEmail(id, userId);
+  if (!monitoredEmail) {
+    return res.status(404).json(apiError('Monitored email not found', 'NOT_FOUND'));
+  }
+
+  return res.json(apiResponse(monitoredEmail));
+}));
+
 // Add monitored email
 router.post('/monitored-emails', asyncHandler(async (req: Request, res: Response) => {
   const { userId, email, active, categoryId } = req.body;
@@ -188,7 +204,11 @@ router.delete('/monitored-emails/:userId/:id', asyncHandler(async (req: Request,
     return res.status(400).json(apiError('Invalid ID', 'INVALID_ID'));
   }
   
-  await storage.removeMonitoredEmail(userId, id);
+  // Scoped to the user: someone else's ID is indistinguishable from a missing one
+  const removed = await storage.removeMonitoredEmail(userId, id);
+  if (!removed) {
+    return res.status(404).json(apiError('Monitored email not found', 'NOT_FOUND'));
+  }
   return res.json(apiResponse(null, 'Monitored email removed'));
 }));
 
@@ -701,4 +721,26 @@ router.get('/users-with-monitored-emails', asyncHandler(async (req: Request, res
   }
 }));
 
+// Settings and OAuth token for a batch of users, so the
+// daily-digest run makes one call instead of several per user. Keyed by user
+// id; settings are null for users who never saved any (worker defaults apply).
+router.post('/digest-bootstrap', asyncHandler(async (req: Request, res: Response) => {
+  const { userIds } = req.body ?? {};
+
+  if (!Array.isArray(userIds) || !userIds.every(id => typeof id === 'string')) {
+    return res.status(400).json(apiError('userIds must be an array of strings', 'INVALID_FIELD_TYPE'));
+  }
+
+  const bundles = await storage.getDigestBootstrap(userIds);
+  const data: Record<string, unknown> = {};
+  for (const [userId, bundle] of bundles) {
+    data[userId] = {
+      settings: maskUserSettings(bundle.settings),
+      // Same snake_case shape as /oauth-token/:uid
+      oauthToken: bundle.oauthToken && toWorkerOAuthToken(bundle.oauthToken),
+    };
+  }
+  return res.json(apiResponse(data));
+}));
+
 export { router as storageRoutes };
\ No newline at end of file
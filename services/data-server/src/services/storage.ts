@@ -46,6 +46,12 @@ export function getUserId(email: string): string {
   return createHash('sha256').update(email.toLowerCase()).digest('hex');
 }
 
+// Everything the daily-digest run reads per user, fetched for many users at once
+export interface DigestBootstrap {
+  settings: UserSettings | null;
+  oauthToken: OAuthToken | null;
+}
+
 export interface IStorage {
   // Email categories
   getEmailCategories(userId: string): Promise<EmailCategory[]>;
@@ -61,11 +67,11 @@ export interface IStorage {
 
   // Monitored emails
   getMonitoredEmails(userId: string): Promise<MonitoredEmail[]>;
-  getMonitoredEmail(id: number): Promise<MonitoredEmail | undefined>;
+  getMonitoredEmail(id: number, userId?: string): Promise<MonitoredEmail | undefined>;
   addMonitoredEmail(email: InsertMonitoredEmail): Promise<MonitoredEmail>;
   bulkAddMonitoredEmails(userId: string, items: Array<{ email: string; active?: boolean; categoryId?: number | null }>): Promise<MonitoredEmail[]>;
   updateMonitoredEmail(userId: string, id: number, updates: Partial<Pick<MonitoredEmail, 'active' | 'categoryId'>>): Promise<MonitoredEmail | undefined>;
-  removeMonitoredEmail(userId: string, id: number): Promise<void>;
+  removeMonitoredEmail(userId: string, id: number): Promise<boolean>;
   
   // Email digests
   getEmailDigests(userId: string): Promise<EmailDigest[]>;
@@ -93,6 +99,7 @@ export interface IStorage {
   updateOAuthToken(uid: string, updates: Partial<OAuthToken>): Promise<OAuthToken | undefined>;
   getExpiringOAuthTokens(beforeDate: Date): Promise<OAuthToken[]>;
   getUsersWithMonitoredEmails(): Promise<{ id: string }[]>;
+  getDigestBootstrap(userIds: string[]): Promise<Map<string, DigestBootstrap>>;
   createSessionToken(uid: string): Promise<{ sessionToken: string; sessionExpiresAt: Date }>;
   validateSessionToken(sessionToken: string): Promise<{ uid: string; email: string } | null>;
   
@@ -280,9 +287,12 @@ export class DatabaseStorage implements IStorage {
     return await database.select().from(monitoredEmails).where(eq(monitoredEmails.userId, userId));
   }
   
-  async getMonitoredEmail(id: number): Promise<MonitoredEmail | undefined> {
+  async getMonitoredEmail(id: number, userId?: string): Promise<MonitoredEmail | undefined> {
     const database = this.ensureDb();
-    const results = await database.select().from(monitoredEmails).where(eq(monitoredEmails.id, id));
+    const condition = userId
+      ? and(eq(monitoredEmails.id, id), eq(monitoredEmails.userId, userId))
+      : eq(monitoredEmails.id, id);
+    const results = await database.select().from(monitoredEmails).where(condition);
     return results.length > 0 ? results[0] : undefined;
   }
 
@@ -419,7 +429,7 @@ export class DatabaseStorage implements IStorage {
       Object.entries(updates).filter(([, v]) => v !== undefined)
     );
     if (Object.keys(filtered).length === 0) {
-      return this.getMonitoredEmail(id);
+      return this.getMonitoredEmail(id, userId);
     }
     const results = await database.update(monitoredEmails)
       .set(filtered)
@@ -428,10 +438,12 @@ export class DatabaseStorage implements IStorage {
     return results[0];
   }
 
-  async removeMonitoredEmail(userId: string, id: number): Promise<void> {
+  async removeMonitoredEmail(userId: string, id: number): Promise<boolean> {
     const database = this.ensureDb();
-    await database.delete(monitoredEmails)
-      .where(and(eq(monitoredEmails.id, id), eq(monitoredEmails.userId, userId)));
+    const results = await database.delete(monitoredEmails)
+      .where(and(eq(monitoredEmails.id, id), eq(monitoredEmails.userId, userId)))
+      .returning({ id: monitoredEmails.id });
+    return results.length > 0;
   }
   
   // Email digests methods
@@ -837,6 +849,29 @@ export class DatabaseStorage implements IStorage {
     }
   }
 
+  // Settings and OAuth token for each of `userIds` in two queries, instead
+  // of two round trips per user. Unlike getUserSettings,
+  // missing settings are reported as null rather than created.
+  async getDigestBootstrap(userIds: string[]): Promise<Map<string, DigestBootstrap>> {
+    const bundles = new Map<string, DigestBootstrap>(
+      userIds.map(id => [id, { settings: null, oauthToken: null }])
+    );
+    if (userIds.length === 0) return bundles;
+
+    const database = this.ensureDb();
+    const [settingsRows, tokenRows] = await Promise.all([
+      database.select().from(userSettings).where(inArray(userSettings.userId, userIds)),
+      database.select().from(oauthTokens).where(inArray(oauthTokens.uid, userIds)),
+    ]);
+
+    for (const row of settingsRows) bundles.get(row.userId)!.settings = row;
+    for (const row of tokenRows) {
+      const bundle = bundles.get(row.uid)!;
+      bundle.oauthToken ??= row; // first row wins, as in getOAuthTokenByUid
+    }
+    return bundles;
+  }
+
   async createSessionToken(uid: string): Promise<{ sessionToken: string; sessionExpiresAt: Date }> {
     const sessionToken = randomUUID();
     const sessionExpiresAt = new Date(Date.now() + 30 * 24 * 60 * 60 * 1000); // 30 days
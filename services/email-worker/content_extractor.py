@@ -9,18 +9,113 @@ import os
 import re
 import asyncio
 import hashlib
+import importlib.util
 import io
 import aiohttp
-from typing import Dict, FrozenSet, List, Optional
-from bs4 import BeautifulSoup, Comment
-import html2text
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, FrozenSet, List, Optional
+import soupsieve
+from bs4 import BeautifulSoup, Comment, NavigableString, SoupStrainer, Tag
 import trafilatura
 from PIL import Image, UnidentifiedImageError
 
+# lxml's C parser is several times faster than the pure-Python html.parser
+# on newsletter-sized HTML; html.parser remains the fallback if lxml is
+# missing from the environment.
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Non-content elements dropped at parse time, so <head> (and the styles,
+# meta and link tags usually found there) is never built into the tree.
+# Strainers only filter top-level elements: rejecting <html> exposes <head>
+# and <body> to the filter, and anything nested inside <body> is kept.
+_NON_CONTENT_TAGS = frozenset(
+    ('html', 'head', 'title', 'base', 'script', 'style', 'noscript', 'meta', 'link')
+)
+CONTENT_STRAINER = SoupStrainer(lambda name, attrs: name not in _NON_CONTENT_TAGS)
+
+_SIMPLE_SELECTOR_RE = re.compile(
+    r'^(?:([a-z][a-z0-9]*)|#([\w-]+)|\.([\w-]+)|\[([\w-]+)="([^"]*)"\])$'
+)
+
+
+def _compile_selector(selector: str) -> Callable[[Tag], List[Tag]]:
+    """
+    Turn a CSS selector into a function returning its matches under a tag.
+
+    A lone tag, #id, .class or [attr="value"] maps straight onto find_all;
+    anything else is compiled once with soupsieve, instead of on every
+    Tag.select() call.
+    """
+    m = _SIMPLE_SELECTOR_RE.match(selector)
+    if m is None:
+        return soupsieve.compile(selector).select
+    name, id_, class_, attr, value = m.groups()
+    if name:
+        return lambda tag: tag.find_all(name)
+    if id_:
+        return lambda tag: tag.find_all(id=id_)
+    if class_:
+        return lambda tag: tag.find_all(class_=class_)
+    return lambda tag: tag.find_all(attrs={attr: value})
+
+
+# Tags whose content starts and ends a line when flattening a tree to text
+_BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+    'td', 'th', 'tr', 'ul',
+))
+
+
+def _block_text(root: Tag) -> str:
+    """
+    Text of a parsed tree, with a newline around each block-level element.
+
+    Unlike get_text(separator=...), inline markup (<b>, <a>, <span>) doesn't
+    split words; unlike rendering back to HTML for html2text, the existing
+    tree is read in place. Comments and other non-text nodes are skipped.
+    """
+    parts: List[str] = []
+    # Iterative walk: newsletter tables nest deeper than is safe to recurse.
+    stack: List[object] = [root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            parts.append('\n')
+        elif type(node) is NavigableString:
+            parts.append(node)
+        elif isinstance(node, Tag):
+            block = node.name in _BLOCK_TAGS
+            if block:
+                parts.append('\n')
+                stack.append(None)
+            stack.extend(reversed(node.contents))
+    return ''.join(parts)
+
+
+def _trafilatura_markdown(raw_content: str) -> Optional[str]:
+    """
+    trafilatura's markdown extraction of an email body. Module-level and
+    free of extractor state so it can be shipped to a process pool.
+    """
+    return trafilatura.extract(
+        raw_content,
+        output_format='markdown',
+        favor_recall=True,
+        include_links=True,
+        include_tables=False,
+        include_comments=False,
+        include_images=False,
+    )
+
+
 class ContentExtractor:
     """Email content extraction and cleaning"""
 
-    def __init__(self, redis_client=None):
+    def __init__(self, redis_client=None, cpu_pool: Optional[Executor] = None):
         """
         Args:
             redis_client: optional async redis client (redis.asyncio.Redis).
@@ -29,39 +124,89 @@ class ContentExtractor:
                 and candidates seen `_HERO_COUNTER_THRESHOLD`+ times get
                 auto-denied. When None, Phase 3 is off (used by tests + any
                 caller that can't reach Redis).
+            cpu_pool: optional process pool for the CPU-heavy trafilatura
+                pass, so concurrent extractions use more than one core.
+                When None, it runs inline on the event loop. Can also be
+                attached later with use_cpu_pool().
         """
         self._redis = redis_client
-        self.html2text_converter = html2text.HTML2Text()
-        self.html2text_converter.ignore_links = True
-        self.html2text_converter.ignore_images = True
-        self.html2text_converter.ignore_emphasis = True
-        self.html2text_converter.body_width = 0  # No line wrapping
+        self._cpu_pool = cpu_pool
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def use_cpu_pool(self, cpu_pool: Optional[Executor]) -> None:
+        """Attach (or with None, detach) the process pool used for trafilatura"""
+        self._cpu_pool = cpu_pool
+
+    async def aopen(self) -> None:
+        """
+        Open the shared HTTP session used for online-version and hero-image
+        fetches, so they reuse keep-alive connections instead of paying a
+        DNS + TCP + TLS handshake per email.
+
+        The session is bound to the running event loop. tasks.py runs every
+        task on one long-lived loop per worker process, opens the session on
+        first use and aclose()s it when the process shuts down. Until then
+        every fetch falls back to a one-off session.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, limit_per_host=5, ttl_dns_cache=300)
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session opened by aopen()"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """The shared session if aopen() was called, otherwise a one-off one"""
+        if self._session is not None and not self._session.closed:
+            yield self._session
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
     
-    async def extract_newsletter_content(self, raw_content: str) -> str:
+    async def extract_newsletter_content(self, raw_content: str, mime_type: Optional[str] = None) -> str:
         """
         Extract clean newsletter content from raw email HTML/text
         Extracted from server/gmail.ts extractNewsletterContent function
+
+        mime_type is the Gmail part's MIME type when known; for text/html and
+        text/plain it decides the path, otherwise the content is sniffed.
         """
         if not raw_content:
             return ''
 
         # If it's already plain text, return with basic cleanup
-        if not self._contains_html(raw_content):
+        if mime_type == 'text/plain' or (
+            mime_type != 'text/html' and not self._contains_html(raw_content)
+        ):
             return self._clean_text_content(raw_content)
 
         try:
             # Load HTML content with BeautifulSoup
-            soup = BeautifulSoup(raw_content, 'html.parser')
+            soup = BeautifulSoup(raw_content, HTML_PARSER, parse_only=CONTENT_STRAINER)
 
-            # Try the "view online" link first — only reads the soup, does not mutate it.
-            # (Must come before _extract_from_email_html, which decomposes cruft links
-            # including "View in browser" anchors, making them unfindable afterwards.)
-            online_content = await self._try_extract_from_online_version(soup)
+            # One walk for the anchors, shared by online-link detection and the
+            # legacy extractor's cruft-link removal.
+            anchors = soup.find_all('a')
 
+            # Try the "view online" link — only reads the soup, does not mutate it.
+            # (Must finish before _extract_from_email_html, which decomposes cruft links
+            # including "View in browser" anchors, making them unfindable afterwards.)
+            #
             # PRIMARY: trafilatura. Handles nested-table layouts, boilerplate
             # detection, and section preservation that the selector-lottery
             # below can't touch. Returns clean markdown with links intact.
-            email_html_content = self._extract_with_trafilatura(raw_content)
+            #
+            # Run together: trafilatura works in the CPU pool while the online
+            # version is being fetched. Neither raises.
+            online_content, email_html_content = await asyncio.gather(
+                self._try_extract_from_online_version(anchors),
+                self._extract_with_trafilatura(raw_content),
+            )
 
             # FALLBACK: legacy selector-based extraction. Kept as a safety net
             # for emails where trafilatura returns nothing (plain-text-only
@@ -72,7 +217,7 @@ class ContentExtractor:
                     f"({len(email_html_content) if email_html_content else 0} chars), "
                     f"falling back to legacy selector extraction"
                 )
-                email_html_content = await self._extract_from_email_html(soup, raw_content)
+                email_html_content = await self._extract_from_email_html(soup, raw_content, anchors)
 
             # Accept the online version only when it's meaningfully richer.
             # Many ESPs serve browser-view portals that return only footer boilerplate
@@ -92,8 +237,17 @@ class ContentExtractor:
             return self._clean_text_content(self._strip_html_tags(raw_content))
     
     def _contains_html(self, content: str) -> bool:
-        """Check if content contains HTML tags"""
-        return '<html' in content.lower() or '<HTML' in content or bool(re.search(r'<[^>]+>', content))
+        """
+        Check if content contains HTML tags, i.e. a '<', something other
+        than '>', then a '>' (what <[^>]+> would match).
+
+        Done with str.find so large bodies are neither lowercased nor
+        rescanned by a regex from every '<'.
+        """
+        start = content.find('<')
+        while start != -1 and content.startswith('>', start + 1):
+            start = content.find('<', start + 2)
+        return start != -1 and content.find('>', start + 2) != -1
     
     # ESP browser-view and click-tracking URL patterns.
     # These portal/redirect URLs serve minimal wrapper pages, never the newsletter's
@@ -106,35 +260,27 @@ class ContentExtractor:
         re.I,
     )
 
-    async def _try_extract_from_online_version(self, soup: BeautifulSoup) -> Optional[str]:
+    # "View online" links: lowercased link text and (case-sensitive) href
+    # must both contain one of these
+    _ONLINE_LINK_TEXT_RE = re.compile('view|browser|online')
+    _ONLINE_LINK_HREF_RE = re.compile('view|browser|web|newsletter|email')
+
+    async def _try_extract_from_online_version(self, anchors: List[Tag]) -> Optional[str]:
         """
-        Try to find "view online" links and scrape better content
+        Try to find "view online" links among the email's <a> tags and
+        scrape better content
         Extracted from server/gmail.ts tryExtractFromOnlineVersion function
         """
         try:
-            # Common patterns for "view online" links
-            online_patterns = [
-                'a[href*="view"]:contains("online")',
-                'a[href*="browser"]:contains("view")',
-                'a[href*="web"]:contains("view")',
-                'a:contains("View in browser")',
-                'a:contains("Read online")',
-                'a:contains("Open in browser")',
-                'a:contains("View this email in your browser")',
-                'a:contains("Having trouble viewing")',
-                'a[href*="newsletter"]:contains("view")',
-                'a[href*="email"]:contains("view")'
-            ]
-            
             online_url = None
             
-            # Look for view online links
-            for link in soup.find_all('a', href=True):
-                link_text = link.get_text(strip=True).lower()
+            # Look for view online links (href checked first: it's already a
+            # string, while the link text has to be collected from the subtree)
+            for link in anchors:
                 href = link.get('href', '')
                 
-                if any(pattern in link_text for pattern in ['view', 'browser', 'online']) and \
-                   any(url_pattern in href for url_pattern in ['view', 'browser', 'web', 'newsletter', 'email']):
+                if self._ONLINE_LINK_HREF_RE.search(href) and \
+                   self._ONLINE_LINK_TEXT_RE.search(link.get_text(strip=True).lower()):
                     if href.startswith(('http', 'https')):
                         online_url = href
                         print(f"🔗 Found online version link: {online_url}")
@@ -156,13 +302,13 @@ class ContentExtractor:
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
                 }
                 
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(online_url, headers=headers) as response:
+                async with self._http_session() as session:
+                    async with session.get(online_url, headers=headers, timeout=timeout) as response:
                         if response.status != 200:
                             return None
                         
                         html = await response.text()
-                        online_soup = BeautifulSoup(html, 'html.parser')
+                        online_soup = BeautifulSoup(html, HTML_PARSER, parse_only=CONTENT_STRAINER)
                         
                         # Extract content from the online version
                         return await self._extract_from_email_html(online_soup, html)
@@ -189,7 +335,32 @@ class ContentExtractor:
         re.IGNORECASE,
     )
 
-    def _extract_with_trafilatura(self, raw_content: str) -> Optional[str]:
+    # Seconds a pooled call is waited for before its result is given up on
+    _CPU_POOL_TIMEOUT = 60
+
+    async def _run_cpu_bound(self, fn, *args):
+        """
+        Run fn(*args) in the CPU pool if there is one (and it works), else
+        inline. Returns None if the pooled call exceeds _CPU_POOL_TIMEOUT;
+        the pool is kept, and the input is not retried inline.
+        """
+        if self._cpu_pool is not None:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(self._cpu_pool, fn, *args),
+                    self._CPU_POOL_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                print(f"⚠️  CPU pool call timed out after {self._CPU_POOL_TIMEOUT}s")
+                return None
+            # BrokenProcessPool: a worker died; AssertionError: this process
+            # is daemonic and may not start children.
+            except (BrokenProcessPool, AssertionError) as e:
+                print(f"⚠️  CPU pool unavailable, running inline: {e!r}")
+                self._cpu_pool = None
+        return fn(*args)
+
+    async def _extract_with_trafilatura(self, raw_content: str) -> Optional[str]:
         """Run trafilatura against the raw email HTML. Returns None on
         failure or when the extracted body is too short to trust — callers
         should fall back to the legacy selector-based extractor in that case.
@@ -207,15 +378,7 @@ class ContentExtractor:
             present in emails but would leak through on online-version pages.
         """
         try:
-            extracted = trafilatura.extract(
-                raw_content,
-                output_format='markdown',
-                favor_recall=True,
-                include_links=True,
-                include_tables=False,
-                include_comments=False,
-                include_images=False,
-            )
+            extracted = await self._run_cpu_bound(_trafilatura_markdown, raw_content)
         except Exception as e:
             print(f"⚠️  trafilatura extraction failed: {e}")
             return None
@@ -229,6 +392,13 @@ class ContentExtractor:
 
         return self._clean_markdown_content(extracted)
 
+    # CSS at-rule blocks (one level of nesting) that leak through as text
+    _CSS_AT_RULE_RE = re.compile(
+        r'@(media|font-face|keyframes|supports|import|charset)[^{]*\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',
+        re.DOTALL,
+    )
+    _BLANK_LINE_RUN_RE = re.compile(r'\n{3,}')
+
     def _clean_markdown_content(self, text: str) -> str:
         """Post-process trafilatura markdown output.
 
@@ -241,12 +411,7 @@ class ContentExtractor:
 
         # Strip CSS blocks that occasionally survive HTML parsing (seen on
         # Substack online-view pages where <style> leaks as text).
-        text = re.sub(
-            r'@(media|font-face|keyframes|supports|import|charset)[^{]*\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',
-            '',
-            text,
-            flags=re.DOTALL,
-        )
+        text = self._CSS_AT_RULE_RE.sub('', text)
 
         # Truncate at the first footer-boilerplate signal. Everything after
         # is "view in browser / sent to / unsubscribe / privacy policy" noise.
@@ -257,31 +422,111 @@ class ContentExtractor:
         # Normalise: strip per-line trailing whitespace, collapse 3+ blank
         # lines to 2, trim overall.
         text = '\n'.join(line.rstrip() for line in text.split('\n'))
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = self._BLANK_LINE_RUN_RE.sub('\n\n', text)
         return text.strip()
 
-    async def _extract_from_email_html(self, soup: BeautifulSoup, raw_content: str) -> str:
+    _STYLE_SCRIPT_BLOCK_RE = re.compile(
+        r'<(style|script|noscript)\b[^>]*>.*?</\1\s*>',
+        re.IGNORECASE | re.DOTALL,
+    )
+    _HIDDEN_STYLE_RE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden')
+    # Tracking and cruft fragments looked for in class and id attributes
+    _CRUFT_ATTR_RE = re.compile(
+        'unsubscribe|footer|social-links|header-logo|nav|navigation'
+        '|sidebar|advertisement|ad|promo|sponsor|banner|tracking'
+        '|pixel|beacon',
+        re.I,
+    )
+    # Cruft link texts (matched against lowercased link text); the parent of
+    # a matching link is removed
+    _CRUFT_LINK_TEXT_RE = re.compile(
+        'unsubscribe|manage preferences|view in browser|forward to a friend'
+        '|add to address book|whitelist|privacy policy|terms|contact us'
+        '|follow us|like us|tweet|share|facebook|twitter|linkedin'
+        '|instagram|youtube|update preferences|email preferences'
+    )
+
+    # Content selectors in order of preference, compiled once
+    _CONTENT_SELECTORS = [
+        (selector, _compile_selector(selector)) for selector in (
+            # Newsletter-specific selectors (high priority)
+            '[role="article"]', 'article', '.article-content', '.newsletter-content',
+            '.email-content', '.main-content', '.content-wrapper', '.email-body',
+
+            # Generic content selectors
+            '.content', '.main', '.body', '.wrapper .content',
+            '[role="main"]', 'main', '#content', '#main',
+
+            # Table-based newsletters
+            'table[role="presentation"] td',
+            'table td[style*="padding"]',
+            'table.email-container td', 'table.newsletter td',
+            'table[width] td',
+
+            # Container patterns
+            '.container .content', '.email-container .content',
+            '.newsletter-container', '.email-wrapper .content'
+        )
+    ]
+
+    # Non-content elements removed from <body> when no content selector matched
+    _BODY_CLEANERS = [
+        _compile_selector(selector) for selector in (
+            'header', 'footer', 'nav', 'aside', '.sidebar', '.nav', '.navigation',
+            '.header', '.footer', '.social', '.share', '.follow', '.ad', '.advertisement',
+            '.unsubscribe', '.preferences', '.manage', '.contact', '.about'
+        )
+    ]
+
+    def _has_cruft_class_or_id(self, tag) -> bool:
+        """find_all filter: the tag's class or id contains a cruft fragment"""
+        classes = tag.get('class')
+        if classes and self._CRUFT_ATTR_RE.search(' '.join(classes)):
+            return True
+        tag_id = tag.get('id')
+        return bool(tag_id and self._CRUFT_ATTR_RE.search(tag_id))
+
+    @staticmethod
+    def _has_enough_text(element: Tag) -> bool:
+        """
+        Whether element.get_text(strip=True) is over 100 chars and 15 words,
+        reading the element's strings only until both are reached.
+
+        get_text(strip=True) joins the stripped strings with no separator,
+        so the last word of one string runs into the first of the next.
+        """
+        chars = words = 0
+        for string in element.stripped_strings:
+            chars += len(string)
+            words += len(string.split()) - (1 if words else 0)
+            if chars > 100 and words > 15:
+                return True
+        return False
+
+    async def _extract_from_email_html(
+        self, soup: BeautifulSoup, raw_content: str, anchors: Optional[List[Tag]] = None
+    ) -> str:
         """
         Advanced email HTML content extraction
         Extracted from server/gmail.ts extractFromEmailHTML function
+
+        anchors, if given, is soup.find_all('a') taken by the caller, reused
+        instead of walking the tree for links again.
         """
         # Step 0: Re-parse with <style>/<script> stripped at the string level.
         # html.parser occasionally preserves <style> text as siblings on Substack's
         # online-view pages (CSS-in-JS / inline-styled pullquote blocks), causing
         # @media { ... } blocks to leak into the final text. Strip before parsing.
-        stripped = re.sub(
-            r'<(style|script|noscript)\b[^>]*>.*?</\1\s*>',
-            '',
-            raw_content,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        stripped = self._STYLE_SCRIPT_BLOCK_RE.sub('', raw_content)
         if stripped != raw_content:
             try:
-                soup = BeautifulSoup(stripped, 'html.parser')
+                soup = BeautifulSoup(stripped, HTML_PARSER)
+                anchors = None  # they belong to the caller's soup
             except Exception:
                 pass  # keep the caller's soup
 
-        # Step 1: Aggressively remove all non-content elements
+        # Step 1: Aggressively remove all non-content elements (CONTENT_STRAINER
+        # doesn't reach inside <body>, and the Step 0 re-parse doesn't use it)
         for element in soup(['script', 'style', 'noscript', 'meta', 'link']):
             element.decompose()
         
@@ -293,33 +538,22 @@ class ContentExtractor:
                 img.decompose()
         
         # Remove hidden elements
-        for element in soup.find_all(style=re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden')):
+        for element in soup.find_all(style=self._HIDDEN_STYLE_RE):
             element.decompose()
         
-        # Remove tracking and cruft classes
-        cruft_selectors = [
-            'unsubscribe', 'footer', 'social-links', 'header-logo', 'nav', 'navigation',
-            'sidebar', 'advertisement', 'ad', 'promo', 'sponsor', 'banner', 'tracking',
-            'pixel', 'beacon'
-        ]
-        
-        for selector in cruft_selectors:
-            for element in soup.find_all(class_=re.compile(selector, re.I)):
+        # Remove tracking and cruft classes/ids, collected in a single tree walk.
+        # Elements inside an already-removed match are skipped.
+        for element in soup.find_all(self._has_cruft_class_or_id):
+            if not element.decomposed:
                 element.decompose()
-            for element in soup.find_all(id=re.compile(selector, re.I)):
-                element.decompose()
-        
-        # Step 2: Remove elements with cruft text content
-        cruft_texts = [
-            'unsubscribe', 'manage preferences', 'view in browser', 'forward to a friend',
-            'add to address book', 'whitelist', 'privacy policy', 'terms', 'contact us',
-            'follow us', 'like us', 'tweet', 'share', 'facebook', 'twitter', 'linkedin',
-            'instagram', 'youtube', 'update preferences', 'email preferences'
-        ]
         
-        for link in soup.find_all('a'):
+        # Step 2: Remove elements with cruft text content. Links inside
+        # anything removed so far (or by this loop) are skipped.
+        for link in soup.find_all('a') if anchors is None else anchors:
+            if link.decomposed:
+                continue
             link_text = link.get_text(strip=True).lower()
-            if any(cruft in link_text for cruft in cruft_texts):
+            if self._CRUFT_LINK_TEXT_RE.search(link_text):
                 # Remove the parent element to get rid of surrounding structure
                 parent = link.parent
                 if parent:
@@ -330,36 +564,14 @@ class ContentExtractor:
         # Step 3: Target main content areas
         main_content = None
         
-        # Content selectors in order of preference
-        content_selectors = [
-            # Newsletter-specific selectors (high priority)
-            '[role="article"]', 'article', '.article-content', '.newsletter-content',
-            '.email-content', '.main-content', '.content-wrapper', '.email-body',
-            
-            # Generic content selectors
-            '.content', '.main', '.body', '.wrapper .content',
-            '[role="main"]', 'main', '#content', '#main',
-            
-            # Table-based newsletters
-            'table[role="presentation"] td',
-            'table td[style*="padding"]',
-            'table.email-container td', 'table.newsletter td',
-            'table[width] td',
-            
-            # Container patterns
-            '.container .content', '.email-container .content',
-            '.newsletter-container', '.email-wrapper .content'
-        ]
-        
-        for selector in content_selectors:
+        for selector, find_matches in self._CONTENT_SELECTORS:
             try:
-                elements = soup.select(selector)
+                elements = find_matches(soup)
                 for element in elements:
-                    text = element.get_text(strip=True)
                     # More lenient content requirements
-                    if len(text) > 100 and len(text.split()) > 15:
+                    if self._has_enough_text(element):
                         main_content = element
-                        print(f"✅ Found content using selector: {selector} ({len(text)} chars)")
+                        print(f"✅ Found content using selector: {selector}")
                         break
                 
                 if main_content:
@@ -371,14 +583,8 @@ class ContentExtractor:
         # Step 4: Fallback with body cleaning
         if not main_content and soup.body:
             # Remove non-content elements from body
-            body_cleaners = [
-                'header', 'footer', 'nav', 'aside', '.sidebar', '.nav', '.navigation',
-                '.header', '.footer', '.social', '.share', '.follow', '.ad', '.advertisement',
-                '.unsubscribe', '.preferences', '.manage', '.contact', '.about'
-            ]
-            
-            for selector in body_cleaners:
-                for element in soup.body.select(selector):
+            for find_matches in self._BODY_CLEANERS:
+                for element in find_matches(soup.body):
                     element.decompose()
             
             main_content = soup.body
@@ -387,14 +593,8 @@ class ContentExtractor:
         if not main_content:
             main_content = soup
         
-        # Step 6: Convert to clean text
-        if main_content:
-            html_content = str(main_content)
-        else:
-            html_content = raw_content
-        
-        # Use html2text for conversion
-        clean_text = self.html2text_converter.handle(html_content)
+        # Step 6: Convert to clean text, straight from the tree
+        clean_text = _block_text(main_content)
         final_content = self._clean_text_content(clean_text)
         
         # If extracted content is too short, fall back to basic text extraction
@@ -746,7 +946,7 @@ class ContentExtractor:
             return None
 
         try:
-            soup = BeautifulSoup(raw_content, 'html.parser')
+            soup = BeautifulSoup(raw_content, HTML_PARSER)
         except Exception as e:
             print(f"⚠️  Hero image extraction: HTML parse failed: {e}")
             return None
@@ -1016,8 +1216,8 @@ class ContentExtractor:
                 'User-Agent': 'Mozilla/5.0 (compatible; SubsBuzz/2.0; +https://subsbuzz.com)',
                 'Accept': 'image/*,*/*;q=0.5',
             }
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, headers=headers) as resp:
+            async with self._http_session() as session:
+                async with session.get(url, headers=headers, timeout=timeout) as resp:
                     if resp.status != 200:
                         return None
                     # aiohttp's StreamReader.read(n) returns after one buffer
@@ -1137,6 +1337,8 @@ class ContentExtractor:
             print(f"⚠️  Text-image detect failed: {e}")
             return False
 
+    _SENDER_DOMAIN_RE = re.compile(r'@([A-Za-z0-9.\-]+)')
+
     @staticmethod
     def domain_from_sender(sender: str) -> Optional[str]:
         """Pull the domain from a raw From header or bare email address.
@@ -1145,12 +1347,29 @@ class ContentExtractor:
         """
         if not sender:
             return None
-        m = re.search(r'@([A-Za-z0-9.\-]+)', sender)
+        m = ContentExtractor._SENDER_DOMAIN_RE.search(sender)
         return m.group(1).lower() if m else None
 
+    _STRIP_TAG_RE = re.compile(r'<[^>]*>')
+
     def _strip_html_tags(self, content: str) -> str:
         """Remove HTML tags from content"""
-        return re.sub(r'<[^>]*>', ' ', content)
+        return self._STRIP_TAG_RE.sub(' ', content)
+
+    # _clean_text_content patterns, compiled once rather than per email
+    _CSS_RULE_RE = re.compile(
+        r'(?:^|\n)\s*[.#][\w\-,\s.#:>+~\[\]()"\'=]+\s*\{[^{}]{0,2000}\}', re.DOTALL
+    )
+    _WHITESPACE_RE = re.compile(r'\s+')
+    # Footer phrases; each line is cut from the first one it contains
+    _CRUFT_TAIL_RE = re.compile(
+        r'(?:Click here to view|This email was sent to|You received this|To unsubscribe).*$',
+        re.MULTILINE,
+    )
+    # Quoted-text lines and separator lines (---, ***, ===)
+    _QUOTED_OR_SEPARATOR_LINE_RE = re.compile(
+        r'^(?:>.*|\s*[\*\-\_\=]{3,}\s*)$', re.MULTILINE
+    )
     
     def _clean_text_content(self, text: str) -> str:
         """
@@ -1164,32 +1383,22 @@ class ContentExtractor:
         # pages where <style> content leaked through as text nodes).
         # Matches @media/@font-face/@keyframes wrappers and standalone selector { ... }
         # declarations. Done before whitespace collapsing so the DOTALL pass still works.
-        text = re.sub(r'@(media|font-face|keyframes|supports|import|charset)[^{]*\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', '', text, flags=re.DOTALL)
-        text = re.sub(r'(?:^|\n)\s*[.#][\w\-,\s.#:>+~\[\]()"\'=]+\s*\{[^{}]{0,2000}\}', '', text, flags=re.DOTALL)
+        text = self._CSS_AT_RULE_RE.sub('', text)
+        text = self._CSS_RULE_RE.sub('', text)
 
-        # Remove multiple consecutive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove excessive newlines (more than 2)
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        
-        # Remove leading/trailing whitespace per line
-        lines = [line.strip() for line in text.split('\n')]
-        text = '\n'.join(lines)
-        
-        # Remove empty lines at start/end
-        text = re.sub(r'^\n+|\n+$', '', text)
+        # Collapse all whitespace, newlines included, to single spaces. The
+        # text is a single line from here on, so there are no blank lines to
+        # squeeze or per-line padding to trim.
+        text = self._WHITESPACE_RE.sub(' ', text).strip()
 
         # Remove common email artifacts. Do NOT strip [brackets] or |pipes| —
         # newsletters routinely use [Forbes], [Reuters], [WSJ] for source
         # attribution (see AdExchanger's "But Wait! There's More!" section),
         # and the naive pattern deletes the attribution along with the prose.
-        text = re.sub(r'^>.*$', '', text, flags=re.MULTILINE)  # Remove quoted text lines
-        text = re.sub(r'Click here to view.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'This email was sent to.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'You received this.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'To unsubscribe.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^\s*[\*\-\_\=]{3,}\s*$', '', text, flags=re.MULTILINE)  # Remove separator lines
+        # Cutting footer phrases can leave a bare separator behind, so that
+        # pass runs first; quoted lines are unaffected by the order.
+        text = self._CRUFT_TAIL_RE.sub('', text)
+        text = self._QUOTED_OR_SEPARATOR_LINE_RE.sub('', text)
         
         # Final cleanup
         return text.strip()
\ No newline at end of file
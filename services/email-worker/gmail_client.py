@@ -7,8 +7,10 @@ Extracted from server/gmail.ts with Python implementation.
 
 import os
 import json
-import base64
+import time
+import binascii
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 import asyncio
@@ -20,6 +22,17 @@ from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+# base64url -> standard base64 alphabet, for _b64url_decode
+_URLSAFE_TO_STD = bytes.maketrans(b'-_', b'+/')
+
+
+def _b64url_decode(data: str) -> bytes:
+    """
+    Decode Gmail's base64url body data: the same result as
+    base64.urlsafe_b64decode, without its Python-level wrappers.
+    """
+    return binascii.a2b_base64(data.encode('ascii').translate(_URLSAFE_TO_STD))
+
 
 class OAuthRevokedError(Exception):
     """
@@ -49,6 +62,9 @@ class ParsedEmail:
     # fall back to Tier 5 (from address) on the server side.
     list_id: Optional[str] = None
     from_display_name: Optional[str] = None
+    # MIME type of the part `content` came from ('text/html' / 'text/plain'),
+    # so the content extractor doesn't have to sniff for markup.
+    content_type: Optional[str] = None
 
 @dataclass
 class NewsletterSender:
@@ -124,9 +140,10 @@ class GmailClient:
 
             # Refresh the token
             print(f"🔄 Refreshing token for {oauth_data.get('email', 'unknown')}")
-            request = Request()
+            # google-auth refreshes over blocking HTTP; run it in a thread so
+            # concurrent refreshes don't serialize on the event loop
             try:
-                credentials.refresh(request)
+                await asyncio.to_thread(credentials.refresh, Request())
             except RefreshError as e:
                 if 'invalid_grant' in str(e):
                     raise OAuthRevokedError(uid=oauth_data.get('uid', ''), reason=str(e)) from e
@@ -335,6 +352,59 @@ class GmailClient:
             print(f"❌ Error on get_or_create_label('{label_name}'): {e}")
             return None
 
+    # Gmail caps a batch at 100 sub-requests and starts rate-limiting well
+    # before that, so stay at its recommended 50.
+    _GMAIL_BATCH_SIZE = 50
+    # Re-sends of sub-requests that were rate-limited (429) or hit a server
+    # error, with 1s/2s/4s backoff; Gmail answers part of a busy batch that way.
+    _GMAIL_BATCH_RETRIES = 3
+
+    @staticmethod
+    def _is_retryable(error: Optional[Exception]) -> bool:
+        return isinstance(error, HttpError) and (error.resp.status == 429 or error.resp.status >= 500)
+
+    def _batch_get_messages(self, service, messages: List[Dict[str, Any]], **get_kwargs) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Fetch messages with one batched round trip per _GMAIL_BATCH_SIZE
+        messages; get_kwargs (e.g. format) are passed to each messages.get.
+        Sub-requests that fail with 429/5xx are re-sent in a new batch after
+        a backoff, up to _GMAIL_BATCH_RETRIES times. Blocks while backing
+        off, so call it off the event loop.
+        Returns (id, message, error) in the order of `messages`; exactly one
+        of message/error is set.
+        """
+        results: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = {}
+
+        def on_msg(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        pending = [message['id'] for message in messages]
+        for attempt in range(self._GMAIL_BATCH_RETRIES + 1):
+            if attempt:
+                print(f"⏳ Retrying {len(pending)} rate-limited/failed Gmail gets (attempt {attempt})")
+                time.sleep(2 ** (attempt - 1))
+
+            for start in range(0, len(pending), self._GMAIL_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=on_msg)
+                for message_id in pending[start:start + self._GMAIL_BATCH_SIZE]:
+                    batch.add(
+                        service.users().messages().get(userId='me', id=message_id, **get_kwargs),
+                        request_id=message_id,
+                    )
+                batch.execute()
+
+            pending = [
+                message_id for message_id in pending
+                if self._is_retryable(results.get(message_id, (None, None))[1])
+            ]
+            if not pending:
+                break
+
+        return [
+            (message['id'], *results.get(message['id'], (None, RuntimeError('no batch response'))))
+            for message in messages
+        ]
+
     async def fetch_emails(self, monitored_senders: List[str], oauth_data: Dict[str, Any], save_refreshed_token_callback=None) -> List[ParsedEmail]:
         """
         Fetch emails from Gmail API for monitored senders
@@ -395,7 +465,9 @@ class GmailClient:
                     request_kwargs = {'userId': 'me', 'q': search_query, 'maxResults': 200}
                     if page_token:
                         request_kwargs['pageToken'] = page_token
-                    results = service.users().messages().list(**request_kwargs).execute()
+                    results = await asyncio.to_thread(
+                        service.users().messages().list(**request_kwargs).execute
+                    )
                     messages.extend(results.get('messages', []))
                     page_token = results.get('nextPageToken')
                     if not page_token:
@@ -405,24 +477,30 @@ class GmailClient:
                 if not messages:
                     return []
                 
-                # Fetch message details
+                # Fetch message details. googleapiclient blocks on its HTTP
+                # calls, so run them in a thread to keep the event loop free.
+                fetched = await asyncio.to_thread(self._batch_get_messages, service, messages)
+                raw_messages = []
+                for message_id, message_data, error in fetched:
+                    if error is not None:
+                        print(f"⚠️  Error processing message {message_id}: {error}")
+                    else:
+                        raw_messages.append(message_data)
+
+                parsed = await asyncio.gather(
+                    *(self._parse_gmail_message(m) for m in raw_messages),
+                    return_exceptions=True,
+                )
+
                 emails = []
-                for message in messages:
-                    try:
-                        message_data = service.users().messages().get(
-                            userId='me',
-                            id=message['id']
-                        ).execute()
-                        
-                        parsed_email = await self._parse_gmail_message(message_data)
-                        
-                        # Only include emails from monitored senders
-                        if any(sender in parsed_email.sender for sender in valid_senders):
-                            emails.append(parsed_email)
-                            
-                    except Exception as e:
-                        print(f"⚠️  Error processing message {message.get('id', 'unknown')}: {e}")
+                for message_data, parsed_email in zip(raw_messages, parsed):
+                    if isinstance(parsed_email, Exception):
+                        print(f"⚠️  Error processing message {message_data.get('id', 'unknown')}: {parsed_email}")
                         continue
+
+                    # Only include emails from monitored senders
+                    if any(sender in parsed_email.sender for sender in valid_senders):
+                        emails.append(parsed_email)
                 
                 print(f"✅ Successfully processed {len(emails)} emails")
                 return emails
@@ -439,19 +517,27 @@ class GmailClient:
             print(f"❌ Error fetching emails: {e}")
             return []
 
+    @staticmethod
+    def _header_map(headers: List[Dict[str, str]]) -> Dict[str, str]:
+        """Lowercased header name -> value; the first occurrence wins"""
+        hmap: Dict[str, str] = {}
+        for h in headers:
+            hmap.setdefault(h['name'].lower(), h['value'])
+        return hmap
+
     async def _parse_gmail_message(self, message_data: Dict[str, Any]) -> ParsedEmail:
         """
         Parse Gmail API message into ParsedEmail format
         Extracted from server/gmail.ts parseGmailMessage function
         """
-        headers = message_data['payload'].get('headers', [])
-        
+        hmap = self._header_map(message_data['payload'].get('headers', []))
+
         # Extract metadata from headers
-        subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), 'No Subject')
-        from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), '')
-        date_header = next((h['value'] for h in headers if h['name'].lower() == 'date'), '')
+        subject = hmap.get('subject', 'No Subject')
+        from_header = hmap.get('from', '')
+        date_header = hmap.get('date', '')
         # Smart sender parsing: List-Id is the Tier-1 subscription signal.
-        list_id = next((h['value'] for h in headers if h['name'].lower() == 'list-id'), None)
+        list_id = hmap.get('list-id')
 
         # Extract sender email + display name. Supports both
         #   "Publisher Name" <sender@example.com>
@@ -469,12 +555,13 @@ class GmailClient:
                 sender = from_header.split()[-1].strip()
 
         # Extract email content
-        content = await self._extract_message_content(message_data['payload'])
+        content, content_type = await self._extract_message_content(message_data['payload'])
 
-        # Parse received date
+        # Parse received date (any RFC 2822 form, incl. "(PST)" comments and
+        # obsolete zone names)
         try:
-            received_at = datetime.strptime(date_header, '%a, %d %b %Y %H:%M:%S %z').isoformat()
-        except:
+            received_at = parsedate_to_datetime(date_header).isoformat()
+        except (TypeError, ValueError, IndexError):
             received_at = datetime.utcnow().isoformat()
 
         # Create Gmail link
@@ -489,18 +576,22 @@ class GmailClient:
             original_link=original_link,
             list_id=list_id.strip() if isinstance(list_id, str) and list_id.strip() else None,
             from_display_name=from_display_name,
+            content_type=content_type,
         )
     
-    async def _extract_message_content(self, payload: Dict[str, Any]) -> str:
-        """Extract text content from Gmail message payload"""
+    async def _extract_message_content(self, payload: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        Extract text content from Gmail message payload, along with the MIME
+        type of the part it came from (None if unknown)
+        """
         content = ''
+        mime_type = None
         
         try:
             # Check if message has body data
             if payload.get('body') and payload['body'].get('data'):
-                content = base64.urlsafe_b64decode(
-                    payload['body']['data'].encode('ASCII')
-                ).decode('utf-8')
+                content = _b64url_decode(payload['body']['data']).decode('utf-8')
+                mime_type = payload.get('mimeType')
             
             # Check parts for multipart messages
             elif payload.get('parts'):
@@ -518,15 +609,14 @@ class GmailClient:
                 # Use HTML part if available, otherwise text part
                 preferred_part = html_part or text_part
                 if preferred_part and preferred_part.get('body', {}).get('data'):
-                    content = base64.urlsafe_b64decode(
-                        preferred_part['body']['data'].encode('ASCII')
-                    ).decode('utf-8')
+                    content = _b64url_decode(preferred_part['body']['data']).decode('utf-8')
+                    mime_type = preferred_part['mimeType']
             
-            return content.strip()
+            return content.strip(), mime_type
             
         except Exception as e:
             print(f"⚠️  Error extracting message content: {e}")
-            return ''
+            return '', None
     
     # ESP from-domain heuristic for the onboarding scan: even without
     # List-Id/List-Unsubscribe, mail from these platforms is almost always a
@@ -541,12 +631,15 @@ class GmailClient:
         '@mailchimpapp.net',
     )
 
+    # The scan only looks at headers, so fetch just these instead of bodies.
+    _SCAN_METADATA_HEADERS = ['From', 'Subject', 'List-Id', 'List-Unsubscribe', 'List-Unsubscribe-Post']
+
     async def scan_for_newsletters(self, oauth_data: Dict[str, Any]) -> List[NewsletterSender]:
         """
         Scan the user's Gmail for newsletter-shaped messages in the last 72h
-        (TEEPER-208). Detection is RFC-2919/2369 header-driven, with ESP-domain
-        and body-unsubscribe-link fallbacks. Returns NewsletterSender rows
-        carrying the raw signals; the data-server then enriches each with a
+        (TEEPER-208). Detection is RFC-2919/2369 header-driven (only headers
+        are fetched), with an ESP-domain fallback. Returns NewsletterSender
+        rows carrying the raw signals; the data-server then enriches each with a
         publications-registry suggestion.
         """
         try:
@@ -578,7 +671,7 @@ class GmailClient:
                 req = {'userId': 'me', 'q': search_query, 'maxResults': 200}
                 if page_token:
                     req['pageToken'] = page_token
-                results = service.users().messages().list(**req).execute()
+                results = await asyncio.to_thread(service.users().messages().list(**req).execute)
                 messages.extend(results.get('messages', []))
                 page_token = results.get('nextPageToken')
                 if not page_token or len(messages) >= 500:
@@ -590,21 +683,20 @@ class GmailClient:
 
             sender_map: Dict[str, Dict[str, Any]] = {}
 
-            for message in messages:
+            scan_messages = await asyncio.to_thread(
+                self._batch_get_messages, service, messages,
+                format='metadata', metadataHeaders=self._SCAN_METADATA_HEADERS,
+            )
+            for message_id, msg, error in scan_messages:
                 try:
-                    msg = service.users().messages().get(userId='me', id=message['id']).execute()
-                    headers = msg['payload'].get('headers', [])
+                    if error is not None:
+                        raise error
+                    hmap = self._header_map(msg['payload'].get('headers', []))
 
-                    def _h(name: str) -> Optional[str]:
-                        return next(
-                            (h['value'] for h in headers if h['name'].lower() == name.lower()),
-                            None,
-                        )
-
-                    from_header = _h('from') or ''
-                    subject = _h('subject') or ''
-                    list_id = _h('list-id')
-                    list_unsubscribe = _h('list-unsubscribe')
+                    from_header = hmap.get('from') or ''
+                    subject = hmap.get('subject') or ''
+                    list_id = hmap.get('list-id')
+                    list_unsubscribe = hmap.get('list-unsubscribe')
 
                     # Parse "Display Name <addr@example.com>" → (name, email)
                     if '<' in from_header and '>' in from_header:
@@ -618,10 +710,11 @@ class GmailClient:
                         continue
 
                     matches_esp = any(sender_email.endswith(sfx) for sfx in self._NEWSLETTER_ESP_DOMAINS)
-                    has_unsubscribe = await self._check_for_unsubscribe_link(msg['payload'])
+                    # Metadata-only scan: the RFC-2369 header is the unsubscribe signal
+                    has_unsubscribe = bool(list_unsubscribe)
 
                     # A sender qualifies on ANY of these signals.
-                    qualifies = bool(list_id) or bool(list_unsubscribe) or matches_esp or has_unsubscribe
+                    qualifies = bool(list_id) or has_unsubscribe or matches_esp
                     if not qualifies:
                         continue
 
@@ -652,7 +745,7 @@ class GmailClient:
                         }
 
                 except Exception as e:
-                    print(f"⚠️  Error processing scan message {message.get('id', 'unknown')}: {e}")
+                    print(f"⚠️  Error processing scan message {message_id}: {e}")
                     continue
 
             # Sort by signal strength: registry hits handled later in tasks.py;
@@ -669,29 +762,3 @@ class GmailClient:
         except Exception as e:
             print(f"❌ Error scanning for newsletters: {e}")
             return []
-    
-    async def _check_for_unsubscribe_link(self, payload: Dict[str, Any]) -> bool:
-        """Check if an email contains unsubscribe links"""
-        try:
-            content = await self._extract_message_content(payload)
-            
-            if not content:
-                return False
-            
-            # Check for common unsubscribe patterns
-            unsubscribe_patterns = [
-                'unsubscribe',
-                'opt-out',
-                'manage.*preferences',
-                'email.*preferences',
-                'subscription.*settings',
-                'remove.*from.*list',
-                'list-unsubscribe'
-            ]
-            
-            content_lower = content.lower()
-            return any(pattern in content_lower for pattern in unsubscribe_patterns)
-            
-        except Exception as e:
-            print(f"⚠️  Error checking for unsubscribe link: {e}")
-            return False
\ No newline at end of file
@@ -38,6 +38,13 @@ app.config_from_object({
     'result_serializer': 'json',
     'timezone': 'UTC',
     'enable_utc': True,
+    # Tasks are long and I/O-bound (Gmail, OpenAI, data-server round trips):
+    # reserve one at a time so short tasks don't queue behind long ones on a
+    # busy child, and ack on completion so a lost worker's task is redelivered
+    # (process_user_emails is guarded by its per-day idempotency check).
+    'worker_prefetch_multiplier': 1,
+    'task_acks_late': True,
+    'task_reject_on_worker_lost': True,
     'beat_schedule': {
         'daily-digest-generation': {
             'task': 'tasks.generate_daily_digests',
@@ -7,12 +7,16 @@ Background tasks for email processing, digest generation, and OAuth token manage
 import os
 import asyncio
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import httpx
+import orjson
 from dataclasses import asdict
 from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import List, Dict, Any, Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
-from celery import Celery
+from celery import Celery, group
+from celery.signals import worker_process_init, worker_process_shutdown
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,10 @@ app.config_from_object({
     'result_serializer': 'json',
     'timezone': 'UTC',
     'enable_utc': True,
+    # Same prefetch/ack settings as main.py
+    'worker_prefetch_multiplier': 1,
+    'task_acks_late': True,
+    'task_reject_on_worker_lost': True,
 })
 
 # Data server configuration
@@ -58,6 +66,65 @@ except Exception as _e:
 gmail_client = GmailClient()
 content_extractor = ContentExtractor(redis_client=_hero_redis)
 
+# trafilatura extraction is CPU-bound and holds the GIL, so it runs in a
+# process pool. Each Celery child process creates its own: this module is
+# imported by the parent before it forks, and a pool built here would be
+# shared by every child, whose submissions then corrupt its queues. 'spawn'
+# so pool workers don't inherit a running event loop.
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+
+@worker_process_init.connect
+def _start_extract_pool(**kwargs):
+    """Create this worker process's extraction pool"""
+    global _extract_pool
+    _extract_pool = ProcessPoolExecutor(
+        max_workers=int(os.getenv('EXTRACT_POOL_PROCESSES', os.cpu_count() or 1)),
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+    content_extractor.use_cpu_pool(_extract_pool)
+
+
+# One event loop per worker process, reused by every task, so clients bound
+# to it (the extractor's HTTP session, the hero Redis pool) live across tasks
+# instead of being rebuilt around a fresh asyncio.run() loop each time.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run(coro):
+    """Run a task coroutine to completion on this process's event loop"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_shutdown.connect
+def _close_event_loop(**kwargs):
+    """
+    Close the extraction pool, the shared HTTP clients and the loop when a
+    worker process exits
+    """
+    if _extract_pool is not None:
+        content_extractor.use_cpu_pool(None)
+        _extract_pool.shutdown(wait=False, cancel_futures=True)
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        _loop.run_until_complete(content_extractor.aclose())
+        _loop.run_until_complete(data_server.aclose())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
+
+
+async def _with_extractor_session(coro):
+    """Run a task coroutine with content_extractor's shared HTTP session open"""
+    await content_extractor.aopen()
+    return await coro
+
+
 class DataServerClient:
     """Client for communicating with the data server"""
     
@@ -67,41 +134,49 @@ class DataServerClient:
             'Content-Type': 'application/json',
             'X-Internal-API-Key': INTERNAL_API_SECRET
         }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """
+        The shared client, created on first use so it binds to the worker
+        process's event loop; keeps data-server connections alive across
+        calls and tasks.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def get(self, endpoint: str) -> Dict[Any, Any]:
         """GET request to data server"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}{endpoint}",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._http().get(endpoint, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
     
     async def post(self, endpoint: str, data: Dict[Any, Any]) -> Dict[Any, Any]:
-        """POST request to data server"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}{endpoint}",
-                json=data,
-                headers=self.headers,
-                timeout=300.0
-            )
-            response.raise_for_status()
-            return response.json()
+        """
+        POST request to data server. Bodies are serialized with orjson — the
+        digest payload carries every email's extracted content, and json.dumps
+        behind httpx's json= is the slow part of sending it.
+        """
+        response = await self._http().post(endpoint, content=orjson.dumps(data), timeout=300.0)
+        response.raise_for_status()
+        return response.json()
     
     async def patch(self, endpoint: str, data: Dict[Any, Any]) -> Dict[Any, Any]:
         """PATCH request to data server"""
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{self.base_url}{endpoint}",
-                json=data,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._http().patch(endpoint, json=data, timeout=60.0)
+        response.raise_for_status()
+        return response.json()
 
 data_server = DataServerClient()
 
@@ -131,10 +206,28 @@ def generate_daily_digests(self):
         logger.info("Starting daily digest generation task_id=%s", self.request.id)
         start = datetime.utcnow()
 
-        result = asyncio.run(_generate_daily_digests_async())
+        result = _run(_generate_daily_digests_async())
+
+        # Each eligible user becomes its own process_user_emails task, so the
+        # run spreads over every worker process (and host) instead of pinning
+        # this one, and a failing user retries on its own.
+        queued = [r for r in result['results'] if r['status'] == 'queued']
+        if queued:
+            try:
+                group(
+                    process_user_emails.s(r['user_id'], local_date=r['local_date'])
+                    for r in queued
+                ).apply_async()
+            except Exception:
+                # Nothing was sent; let the retry claim these users again
+                _run(_release_digest_dispatch(queued))
+                raise
 
         duration = (datetime.utcnow() - start).total_seconds()
-        logger.info("Daily digest generation complete duration=%.1fs users=%d", duration, result.get('total_users', 0))
+        logger.info(
+            "Daily digest generation complete duration=%.1fs users=%d queued=%d",
+            duration, result.get('total_users', 0), len(queued),
+        )
         return result
 
     except Exception as exc:
@@ -161,6 +254,47 @@ def _user_is_in_digest_window(user_timezone: str | None) -> tuple[bool, str]:
     return now_utc.hour == 3, now_utc.strftime('%Y-%m-%d')
 
 
+# How long a user's daily dispatch claim is held. Keyed by the user's local
+# date, so it only has to outlast that date's digest window.
+_DIGEST_DISPATCH_CLAIM_TTL = 24 * 3600
+
+
+def _digest_dispatch_key(user_id: str, local_date: str) -> str:
+    return f'digest-dispatch:{user_id}:{local_date}'
+
+
+async def _claim_digest_dispatch(user_id: str, local_date: str) -> bool:
+    """
+    Claim the user's daily digest for local_date; False if it was already
+    dispatched. process_user_emails skips users who already have a digest,
+    but two tasks started together (a retried or overlapping daily run)
+    would both pass that check and both pay for Gmail + OpenAI. Fails open
+    when Redis is unavailable.
+    """
+    if _hero_redis is None:
+        return True
+    try:
+        return bool(await _hero_redis.set(
+            _digest_dispatch_key(user_id, local_date), 1,
+            nx=True, ex=_DIGEST_DISPATCH_CLAIM_TTL,
+        ))
+    except Exception as e:
+        logger.warning("Digest dispatch claim failed user=%s (dispatching anyway): %s", user_id, e)
+        return True
+
+
+async def _release_digest_dispatch(queued: List[Dict[str, Any]]) -> None:
+    """Drop the claims of users whose process_user_emails was never sent"""
+    if _hero_redis is None or not queued:
+        return
+    try:
+        await _hero_redis.delete(*(
+            _digest_dispatch_key(r['user_id'], r['local_date']) for r in queued
+        ))
+    except Exception as e:
+        logger.warning("Digest dispatch release failed: %s", e)
+
+
 async def _generate_daily_digests_async():
     """Async implementation of daily digest generation"""
     try:
@@ -170,14 +304,22 @@ async def _generate_daily_digests_async():
         
         logger.info("Found %d users with monitored emails", len(users))
         
+        # One batched call for every user's settings and OAuth token, instead
+        # of two data-server round trips per user
+        bootstrap_response = await data_server.post(
+            '/api/storage/digest-bootstrap', {'userIds': [user['id'] for user in users]}
+        )
+        bootstrap = bootstrap_response.get('data', {})
+
         results = []
         for user in users:
             user_id = user['id']
             
             try:
-                # Check user settings
-                settings_response = await data_server.get(f'/api/storage/user-settings/{user_id}')
-                settings = settings_response.get('data', {})
+                bundle = bootstrap.get(user_id) or {}
+
+                # Check user settings (none saved yet means the defaults)
+                settings = bundle.get('settings') or {}
                 
                 if not settings.get('dailyDigestEnabled', True):
                     logger.info("Skipping user=%s: daily digest disabled", user_id)
@@ -196,20 +338,22 @@ async def _generate_daily_digests_async():
                 # need to re-consent in the app — until they do, every fetch
                 # would just hit invalid_grant. The frontend banner prompts
                 # them. (TEEPER-204)
-                oauth_check = await data_server.get(f'/api/storage/oauth-token/{user_id}')
-                if (oauth_check.get('data') or {}).get('revoked_at'):
+                oauth_token = bundle.get('oauthToken')
+                if not oauth_token:
+                    raise LookupError('OAuth token not found')
+                if oauth_token.get('revoked_at'):
                     logger.info("Skipping user=%s: oauth revoked", user_id)
                     results.append({'user_id': user_id, 'status': 'oauth_revoked'})
                     continue
 
-                # Process emails for this user
-                result = await process_user_emails_async(user_id, local_date=local_date_str)
-                results.append({
-                    'user_id': user_id,
-                    'status': 'success',
-                    'emails_processed': result.get('emails_processed', 0),
-                    'digest_created': result.get('digest_created', False)
-                })
+                if not await _claim_digest_dispatch(user_id, local_date_str):
+                    logger.info("Skipping user=%s: digest already dispatched for %s", user_id, local_date_str)
+                    results.append({'user_id': user_id, 'status': 'already_dispatched'})
+                    continue
+
+                # Emails are processed by a process_user_emails task per
+                # user, dispatched by generate_daily_digests
+                results.append({'user_id': user_id, 'status': 'queued', 'local_date': local_date_str})
                 
             except Exception as e:
                 logger.error("Error processing user=%s: %s", user_id, e, exc_info=True)
@@ -230,19 +374,22 @@ async def _generate_daily_digests_async():
         raise
 
 @app.task(bind=True, retry_kwargs={'max_retries': 3, 'countdown': 30})
-def process_user_emails(self, user_id: str, force: bool = False):
+def process_user_emails(self, user_id: str, force: bool = False, local_date: Optional[str] = None):
     """
     Process emails for a specific user
     Can be called manually or as part of daily digest generation
 
     force=True bypasses the same-day idempotency guard, used when the user
     explicitly confirms a re-run of today's digest from the UI.
+    local_date is the user's local digest date, passed by the daily run.
     """
     try:
         logger.info("Processing emails user=%s task_id=%s force=%s", user_id, self.request.id, force)
         start = datetime.utcnow()
 
-        result = asyncio.run(process_user_emails_async(user_id, force=force))
+        result = _run(_with_extractor_session(
+            process_user_emails_async(user_id, force=force, local_date=local_date)
+        ))
 
         duration = (datetime.utcnow() - start).total_seconds()
         logger.info("Email processing complete user=%s emails=%d duration=%.1fs", user_id, result.get('emails_processed', 0), duration)
@@ -252,6 +399,25 @@ def process_user_emails(self, user_id: str, force: bool = False):
         logger.error("Email processing failed user=%s: %s", user_id, exc, exc_info=True)
         raise self.retry(exc=exc)
 
+
+async def _drop_gateway_digest_cache(user_id: str) -> None:
+    """
+    DEL the api-gateway's cached digest reads for a user (cache.py's
+    digest_cache, same Redis), so the new digest is served right away
+    instead of after the cache TTL
+    """
+    if _hero_redis is None:
+        return
+    try:
+        await _hero_redis.delete(f'digest:{user_id}')
+    except Exception as e:
+        logger.warning("Gateway digest cache invalidation failed user=%s: %s", user_id, e)
+
+
+# Emails of one user extracted at once
+_EMAIL_EXTRACT_CONCURRENCY = 8
+
+
 async def process_user_emails_async(user_id: str, force: bool = False, local_date: str | None = None) -> Dict[str, Any]:
     """Async implementation of user email processing"""
     try:
@@ -350,58 +516,72 @@ async def process_user_emails_async(user_id: str, force: bool = False, local_dat
 
         logger.info("Fetched %d emails user=%s", len(emails), user_id)
 
-        # Process email content
-        processed_emails = []
-        for email in emails:
-            try:
-                # Convert ParsedEmail dataclass to dict for processing.
-                # gmail_message_id is persisted to digest_emails so post-digest cleanup
-                # tasks can act on the source Gmail message.
-                sender_key = (email.sender or '').strip().lower()
-                monitored_info = sender_to_monitored.get(sender_key, {})
-                email_dict = {
-                    'id': email.id,
-                    'gmail_message_id': email.id,
-                    'sender': email.sender,
-                    'subject': email.subject,
-                    'received_at': email.received_at,
-                    'content': email.content,
-                    'original_link': email.original_link,
-                    # Smart sender parsing (v1): worker forwards header signals
-                    # (List-Id + from display name) plus the monitored_emails
-                    # row id. Data-server's resolveSubscription derives a
-                    # subscription, assigns a category, and persists signals
-                    # to digest_emails.signals_json. sender_id may be None if
-                    # the sender is somehow no longer in monitored_emails —
-                    # data-server treats that as a reason to skip subscription
-                    # resolution and fall back to category_id only.
-                    'sender_id': monitored_info.get('id'),
-                    'list_id': email.list_id,
-                    'from_display_name': email.from_display_name,
-                }
-
-                # Extract hero image BEFORE replacing content with plain text
-                # (hero extraction needs the original HTML; content extraction strips it).
-                # Pass sender_domain so known publisher placeholders (Tilley et al.)
-                # get rejected by the content-hash denylist.
-                sender_domain = content_extractor.domain_from_sender(email.sender or '')
-                hero_image_url = await content_extractor.extract_hero_image_verified(
-                    email_dict['content'], sender_domain=sender_domain
-                )
-                if hero_image_url:
-                    logger.info("hero_image extracted for %s: %s", email.id, hero_image_url)
-
-                # Extract and clean content
-                extracted_content = await content_extractor.extract_newsletter_content(email_dict['content'])
-
-                # Update email with extracted content + hero image URL
-                email_dict['content'] = extracted_content
-                email_dict['hero_image_url'] = hero_image_url
-                processed_emails.append(email_dict)
-
-            except Exception as e:
-                logger.warning("Error processing email id=%s: %s", email.id, e)
-                continue
+        # Process email content. Emails are processed concurrently so their
+        # online-version/hero fetches overlap and trafilatura runs spread
+        # across the extractor's process pool; gather keeps inbox order. The
+        # semaphore bounds how many parsed trees and outbound fetches a large
+        # inbox has in flight at once.
+        sem = asyncio.Semaphore(_EMAIL_EXTRACT_CONCURRENCY)
+
+        async def _process_email(email) -> Optional[Dict[str, Any]]:
+            async with sem:
+                try:
+                    # Convert ParsedEmail dataclass to dict for processing.
+                    # gmail_message_id is persisted to digest_emails so post-digest cleanup
+                    # tasks can act on the source Gmail message.
+                    sender_key = (email.sender or '').strip().lower()
+                    monitored_info = sender_to_monitored.get(sender_key, {})
+                    email_dict = {
+                        'id': email.id,
+                        'gmail_message_id': email.id,
+                        'sender': email.sender,
+                        'subject': email.subject,
+                        'received_at': email.received_at,
+                        'content': email.content,
+                        'original_link': email.original_link,
+                        # Smart sender parsing (v1): worker forwards header signals
+                        # (List-Id + from display name) plus the monitored_emails
+                        # row id. Data-server's resolveSubscription derives a
+                        # subscription, assigns a category, and persists signals
+                        # to digest_emails.signals_json. sender_id may be None if
+                        # the sender is somehow no longer in monitored_emails —
+                        # data-server treats that as a reason to skip subscription
+                        # resolution and fall back to category_id only.
+                        'sender_id': monitored_info.get('id'),
+                        'list_id': email.list_id,
+                        'from_display_name': email.from_display_name,
+                    }
+
+                    # Extract hero image BEFORE replacing content with plain text
+                    # (hero extraction needs the original HTML; content extraction strips it).
+                    # Pass sender_domain so known publisher placeholders (Tilley et al.)
+                    # get rejected by the content-hash denylist.
+                    sender_domain = content_extractor.domain_from_sender(email.sender or '')
+                    hero_image_url = await content_extractor.extract_hero_image_verified(
+                        email_dict['content'], sender_domain=sender_domain
+                    )
+                    if hero_image_url:
+                        logger.info("hero_image extracted for %s: %s", email.id, hero_image_url)
+
+                    # Extract and clean content
+                    extracted_content = await content_extractor.extract_newsletter_content(
+                        email_dict['content'], mime_type=email.content_type
+                    )
+
+                    # Update email with extracted content + hero image URL
+                    email_dict['content'] = extracted_content
+                    email_dict['hero_image_url'] = hero_image_url
+                    return email_dict
+
+                except Exception as e:
+                    logger.warning("Error processing email id=%s: %s", email.id, e)
+                    return None
+
+        processed_emails = [
+            email_dict
+            for email_dict in await asyncio.gather(*(_process_email(email) for email in emails))
+            if email_dict is not None
+        ]
 
         logger.info("Content extraction complete user=%s emails=%d", user_id, len(processed_emails))
 
@@ -430,6 +610,7 @@ async def process_user_emails_async(user_id: str, force: bool = False, local_dat
 
         digest_response = await data_server.post('/api/digest/create', digest_payload)
         digest_result = digest_response.get('data', {})
+        await _drop_gateway_digest_cache(user_id)
 
         # Enqueue per-message cleanup tasks (snapshot action + label into task args).
         # Per-message for retry isolation — one failed message doesn't block the rest.
@@ -465,7 +646,7 @@ def refresh_oauth_tokens(self):
         logger.info("Starting OAuth token refresh task_id=%s", self.request.id)
         start = datetime.utcnow()
 
-        result = asyncio.run(_refresh_oauth_tokens_async())
+        result = _run(_refresh_oauth_tokens_async())
 
         duration = (datetime.utcnow() - start).total_seconds()
         logger.info("OAuth token refresh complete tokens=%d duration=%.1fs", result.get('tokens_checked', 0), duration)
@@ -475,6 +656,11 @@ def refresh_oauth_tokens(self):
         logger.error("OAuth token refresh failed: %s", exc, exc_info=True)
         raise self.retry(exc=exc)
 
+
+# Tokens refreshed at once by the token refresh run
+_TOKEN_REFRESH_CONCURRENCY = 10
+
+
 async def _refresh_oauth_tokens_async():
     """Async implementation of OAuth token refresh"""
     try:
@@ -486,64 +672,67 @@ async def _refresh_oauth_tokens_async():
         
         logger.info("Found %d tokens to refresh", len(tokens))
         
-        results = []
-        for token_data in tokens:
-            # Already-revoked tokens stay revoked until the user reconnects
-            # (which clears revoked_at via storage POST). Skip them so we
-            # don't relog invalid_grant every 6h. (TEEPER-204)
-            if token_data.get('revoked_at'):
-                results.append({
-                    'uid': token_data['uid'],
-                    'email': token_data['email'],
-                    'status': 'skipped_revoked'
-                })
-                continue
-
-            try:
-                # Attempt to refresh the token
-                refreshed = await gmail_client.refresh_oauth_token(token_data)
-
-                if refreshed:
-                    # Update token in database using correct endpoint and field names
-                    update_response = await data_server.patch(f'/api/storage/oauth-token/{token_data["uid"]}', {
-                        'accessToken': refreshed['access_token'],
-                        'refreshToken': refreshed.get('refresh_token'),
-                        'expiresAt': refreshed.get('expires_at')
-                    })
-
-                    if update_response.get('success'):
-                        logger.info("Token refreshed and stored email=%s", token_data['email'])
-
-                    results.append({
+        sem = asyncio.Semaphore(_TOKEN_REFRESH_CONCURRENCY)
+
+        async def _refresh_one(token_data) -> Dict[str, Any]:
+            async with sem:
+                # Already-revoked tokens stay revoked until the user reconnects
+                # (which clears revoked_at via storage POST). Skip them so we
+                # don't relog invalid_grant every 6h. (TEEPER-204)
+                if token_data.get('revoked_at'):
+                    return {
                         'uid': token_data['uid'],
                         'email': token_data['email'],
-                        'status': 'refreshed'
-                    })
-                else:
-                    results.append({
+                        'status': 'skipped_revoked'
+                    }
+
+                try:
+                    # Attempt to refresh the token
+                    refreshed = await gmail_client.refresh_oauth_token(token_data)
+
+                    if refreshed:
+                        # Update token in database using correct endpoint and field names
+                        update_response = await data_server.patch(f'/api/storage/oauth-token/{token_data["uid"]}', {
+                            'accessToken': refreshed['access_token'],
+                            'refreshToken': refreshed.get('refresh_token'),
+                            'expiresAt': refreshed.get('expires_at')
+                        })
+
+                        if update_response.get('success'):
+                            logger.info("Token refreshed and stored email=%s", token_data['email'])
+
+                        return {
+                            'uid': token_data['uid'],
+                            'email': token_data['email'],
+                            'status': 'refreshed'
+                        }
+                    else:
+                        return {
+                            'uid': token_data['uid'],
+                            'email': token_data['email'],
+                            'status': 'failed'
+                        }
+
+                except OAuthRevokedError as e:
+                    logger.warning("OAuth revoked email=%s: %s", token_data.get('email', 'unknown'), e.reason)
+                    await _mark_oauth_revoked(token_data['uid'], e.reason)
+                    return {
                         'uid': token_data['uid'],
                         'email': token_data['email'],
-                        'status': 'failed'
-                    })
+                        'status': 'revoked'
+                    }
 
-            except OAuthRevokedError as e:
-                logger.warning("OAuth revoked email=%s: %s", token_data.get('email', 'unknown'), e.reason)
-                await _mark_oauth_revoked(token_data['uid'], e.reason)
-                results.append({
-                    'uid': token_data['uid'],
-                    'email': token_data['email'],
-                    'status': 'revoked'
-                })
+                except Exception as e:
+                    logger.error("Error refreshing token email=%s: %s", token_data.get('email', 'unknown'), e, exc_info=True)
+                    return {
+                        'uid': token_data['uid'],
+                        'email': token_data['email'],
+                        'status': 'error',
+                        'error': str(e)
+                    }
+
+        results = await asyncio.gather(*(_refresh_one(token_data) for token_data in tokens))
 
-            except Exception as e:
-                logger.error("Error refreshing token email=%s: %s", token_data.get('email', 'unknown'), e, exc_info=True)
-                results.append({
-                    'uid': token_data['uid'],
-                    'email': token_data['email'],
-                    'status': 'error',
-                    'error': str(e)
-                })
-        
         return {
             'tokens_checked': len(tokens),
             'results': results,
@@ -562,7 +751,7 @@ def archive_email(self, user_id: str, gmail_message_id: str):
     """
     try:
         logger.info("Archiving message user=%s message_id=%s task_id=%s", user_id, gmail_message_id, self.request.id)
-        return asyncio.run(_archive_email_async(user_id, gmail_message_id))
+        return _run(_archive_email_async(user_id, gmail_message_id))
     except Exception as exc:
         logger.error("Archive task failed user=%s message_id=%s: %s", user_id, gmail_message_id, exc, exc_info=True)
         raise self.retry(exc=exc)
@@ -606,7 +795,7 @@ def cleanup_digest_email(self, user_id: str, gmail_message_id: str, action: str,
             "Cleanup user=%s message_id=%s action=%s task_id=%s",
             user_id, gmail_message_id, action, self.request.id
         )
-        return asyncio.run(_cleanup_digest_email_async(user_id, gmail_message_id, action, label_name))
+        return _run(_cleanup_digest_email_async(user_id, gmail_message_id, action, label_name))
     except Exception as exc:
         logger.error(
             "Cleanup task failed user=%s message_id=%s action=%s: %s",
@@ -697,7 +886,7 @@ def scan_for_newsletters(self, user_id: str):
     try:
         logger.info("Scanning for newsletters user=%s task_id=%s", user_id, self.request.id)
 
-        return asyncio.run(_scan_for_newsletters_async(user_id))
+        return _run(_scan_for_newsletters_async(user_id))
 
     except Exception as exc:
         logger.error("Newsletter scan failed user=%s: %s", user_id, exc, exc_info=True)
@@ -12,12 +12,15 @@ the wild — the fixture + targeted assertions become the regression alarm.
 import asyncio
 import hashlib
 import io
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
 
 import pytest
+from bs4 import BeautifulSoup
 from PIL import Image
 
-from content_extractor import ContentExtractor
+from content_extractor import HTML_PARSER, ContentExtractor, _block_text
 from tests.conftest import assert_snapshot, load_eml_html
 
 
@@ -712,6 +715,99 @@ def test_adexchanger_output_length_is_substantial(extractor, adexchanger_html):
     )
 
 
+# --- text flattening + MIME routing ---------------------------------------
+
+
+def test_block_text_breaks_lines_only_at_block_elements():
+    """Inline markup must not split words; block elements start new lines.
+    Comments never reach the output."""
+    soup = BeautifulSoup(
+        '<div><p>Hel<b>lo</b> <a href="#">world</a><!-- hidden --></p>'
+        '<ul><li>one</li><li>two</li></ul>tail</div>',
+        HTML_PARSER,
+    )
+    text = _block_text(soup)
+    assert [line for line in text.split("\n") if line] == ["Hello world", "one", "two", "tail"]
+    assert "hidden" not in text
+
+
+def test_block_text_survives_deeply_nested_tables():
+    """Newsletter layouts nest deeper than Python's recursion limit allows
+    a recursive walk to go."""
+    soup = BeautifulSoup("<div>" * 3000 + "deep" + "</div>" * 3000, HTML_PARSER)
+    assert _block_text(soup).strip() == "deep"
+
+
+def test_text_plain_mime_type_is_not_parsed_as_html(extractor):
+    """A text/plain part that happens to contain markup-like text is kept
+    verbatim — sniffing would have sent it down the HTML path and stripped
+    the tags."""
+    content = "Use <b>bold</b> here"
+    assert asyncio.run(
+        extractor.extract_newsletter_content(content, mime_type="text/plain")
+    ) == content
+    assert "<b>" not in asyncio.run(extractor.extract_newsletter_content(content))
+
+
+@pytest.mark.parametrize("mime_type", ["text/plain", "text/html"])
+def test_known_mime_type_skips_sniffing(extractor, monkeypatch, mime_type):
+    def fail(content):
+        raise AssertionError("content was sniffed despite a known MIME type")
+    monkeypatch.setattr(extractor, "_contains_html", fail)
+
+    html = "<p>" + "Editorial paragraph with enough words to keep. " * 20 + "</p>"
+    assert asyncio.run(extractor.extract_newsletter_content(html, mime_type=mime_type))
+
+
+# --- CPU pool fallback ----------------------------------------------------
+
+
+class _BrokenPool(Executor):
+    """Every submission fails the way a pool with a dead worker does"""
+
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+
+class _WedgedPool(Executor):
+    """Accepts work but never resolves it, like a call that runs past the
+    timeout"""
+
+    def submit(self, fn, *args, **kwargs):
+        return Future()
+
+
+def test_run_cpu_bound_falls_back_inline_on_broken_pool():
+    """A broken pool must not fail extraction: the call runs inline and
+    the pool is dropped for later calls."""
+    extractor = ContentExtractor(cpu_pool=_BrokenPool())
+
+    assert asyncio.run(extractor._run_cpu_bound(len, "abc")) == 3
+    assert extractor._cpu_pool is None
+
+
+def test_run_cpu_bound_gives_up_on_slow_call(monkeypatch):
+    """A pooled call past the timeout yields None (callers fall back to the
+    legacy extractor) without re-running the input inline or dropping the
+    pool."""
+    monkeypatch.setattr(ContentExtractor, "_CPU_POOL_TIMEOUT", 0.05)
+    pool = _WedgedPool()
+    extractor = ContentExtractor(cpu_pool=pool)
+
+    def fail(value):
+        raise AssertionError("slow input was re-run inline")
+
+    assert asyncio.run(extractor._run_cpu_bound(fail, "abc")) is None
+    assert extractor._cpu_pool is pool
+
+
+def test_run_cpu_bound_uses_pool():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        extractor = ContentExtractor(cpu_pool=pool)
+        assert asyncio.run(extractor._run_cpu_bound(len, "abc")) == 3
+        assert extractor._cpu_pool is pool
+
+
 # --- snapshot (informational regression alarm) ----------------------------
 
 
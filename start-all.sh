@@ -96,7 +96,7 @@ echo "   🌐 API Gateway → port ${API_GATEWAY_PORT}"
 # Dockerfile CMD, which includes --beat).
 echo "   📧 Email Worker → Celery (no beat)"
 (cd services/email-worker && ./.venv/bin/python -m celery -A main worker \
-    --loglevel=info --concurrency=2 > ../../logs/email-worker.log 2>&1 &)
+    --loglevel=info --concurrency=2 -Ofair > ../../logs/email-worker.log 2>&1 &)
 
 # Frontend (Vite) — override port from env, do NOT use the hardcoded package.json
 echo "   🎨 Frontend → port ${UI_PORT}"